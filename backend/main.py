@@ -1,13 +1,15 @@
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
-import json
+import os
 import sys
 import uuid
+from queue import Queue
 from threading import Thread
 import shutil
 import subprocess
-from typing import Optional
+import tempfile
+from typing import Callable, Optional
 import logging
 
 # =============== DATASET + EXTRACTION ===============
@@ -36,24 +38,72 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SCRIPTS_DIR = BASE_DIR / "backend" / "scripts"
 SESSIONS_DIR = BASE_DIR / "backend" / "sessions"
 SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
+sys.path.insert(0, str(BASE_DIR))
+
+from src.deadline import Deadline, plan_for_budget
+from src.intermediate_store import available_formats, open_store
+from src.decoding_profiles import DECODING_PROFILES, DEFAULT_PROFILE
+from src.pipeline_executor import parse_result
+from src.rouge import RougeEvaluator, RunningRouge
+from src.runtime_config import worker_env
 
 PIPELINE_PROGRESS = {}
 
+# Concurrent inference slots; each gets an equal share of the CPU cores and
+# loads its own model copies, so more than one is opt-in
+INFERENCE_SLOTS = int(os.environ.get("INFERENCE_SLOTS", 1))
+PIN_CPU_AFFINITY = os.environ.get("PIN_CPU_AFFINITY", "0") == "1"
+
+# Model-holding worker processes per stage in dataset mode; they split the
+# slot's cores between them, so throughput scales with documents per run
+DATASET_WORKERS = int(os.environ.get("DATASET_WORKERS", 1))
+WORKER_POOL_TIMEOUT = os.environ.get("WORKER_POOL_TIMEOUT", "3600")
+# Workers memory-map the safetensors checkpoints and share one copy of the weights
+MMAP_MODEL_WEIGHTS = os.environ.get("MMAP_MODEL_WEIGHTS", "1") == "1"
+
+# Opt-in dynamic int8 T5 inference on CPU (see scripts/bench_t5_int8.py)
+T5_INT8 = os.environ.get("T5_INT8", "0") == "1"
+
+# LegalBERT scoring backend: torch, onnx or onnx-int8 (export with
+# scripts/export_legalbert_onnx.py, check with scripts/check_legalbert_onnx.py)
+LEGALBERT_BACKEND = os.environ.get("LEGALBERT_BACKEND", "torch")
+
+# Format of the files stages hand to each other (arrow, msgpack or json);
+# JSON copies are only written when a request asks for them
+INTERMEDIATE_FORMAT = os.environ.get("INTERMEDIATE_FORMAT") or available_formats()[0]
+PIPELINE_STAGES = ["raw", "cleaned", "legalbert", "final"]
+
+# Run all stages in one process so they overlap on a stream of documents
+# (see backend/scripts/streaming_pipeline.py); only raw and final are stored
+STREAMING_PIPELINE = os.environ.get("STREAMING_PIPELINE", "0") == "1"
+
+# Dataset references are tokenized and stemmed once and kept across
+# sessions, so scoring a finished summary only tokenizes the summary
+ROUGE_EVALUATOR = RougeEvaluator()
+
+FREE_SLOTS = Queue()
+for _slot in range(INFERENCE_SLOTS):
+    FREE_SLOTS.put(_slot)
+
 # ================= HELPERS =================
 
-def run_script(script: Path, args: list, cwd: Path):
+def run_script(script: Path, args: list, cwd: Path, env: Optional[dict] = None,
+               on_result: Optional[Callable[[dict], None]] = None):
+    """
+    Runs a stage script. Records it reports on stdout while running are
+    passed to ``on_result`` as they arrive.
+    """
     cmd = [sys.executable, str(script)] + args
-    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr)
-
-def save_json(path: Path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as stderr:
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=stderr, text=True, env=env)
+        for line in proc.stdout:
+            record = parse_result(line)
+            if record is not None and on_result is not None:
+                on_result(record)
+        if proc.wait() != 0:
+            stderr.seek(0)
+            raise RuntimeError(stderr.read())
 
-def load_json(path: Path):
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
 
 # ================= EXTRACTION =================
 
@@ -127,10 +177,24 @@ async def run_pipeline(
     dataset: Optional[str] = Form(None),
     n: Optional[int] = Form(None),
     file: UploadFile = File(None),
+    decoding_profile: str = Form(DEFAULT_PROFILE),
+    latency_budget: Optional[float] = Form(None),
+    export_json: bool = Form(False),
 ):
+    if decoding_profile not in DECODING_PROFILES:
+        raise HTTPException(
+            400, f"Unknown decoding_profile '{decoding_profile}', expected one of {list(DECODING_PROFILES)}"
+        )
+    if latency_budget is not None and latency_budget <= 0:
+        raise HTTPException(400, "latency_budget must be a positive number of seconds")
+
+    # The clock starts when the request arrives, so queueing counts against it
+    deadline = Deadline.after(latency_budget) if latency_budget is not None else None
+
     session_id = str(uuid.uuid4())
     session_path = SESSIONS_DIR / session_id
     session_path.mkdir(parents=True, exist_ok=True)
+    store = open_store(session_path, INTERMEDIATE_FORMAT)
 
     # Save uploaded file synchronously so background thread doesn't read a closed file
     uploaded_file_path = None
@@ -150,13 +214,21 @@ async def run_pipeline(
 
     # Initialize session IMMEDIATELY before any processing
     PIPELINE_PROGRESS[session_id] = {
+        "decoding_profile": decoding_profile,
+        "latency_budget": latency_budget,
+        "plan": None,
+        "degraded": False,
+        "rouge": None,
         "stages": [],
         "completed": False,
         "results": None,
         "error": None
     }
     
-    logger.info(f"[{session_id}] Session initialized - Mode: {mode}")
+    logger.info(
+        f"[{session_id}] Session initialized - Mode: {mode}, Profile: {decoding_profile}, "
+        f"Latency budget: {latency_budget}"
+    )
 
     def update(stage):
         if session_id in PIPELINE_PROGRESS:
@@ -216,7 +288,8 @@ async def run_pipeline(
                         for i, r in enumerate(ds):
                             raw_samples.append({
                                 "id": f"ilc_{i}",
-                                "input_text": r.get("Case", "")
+                                "input_text": r.get("Case", ""),
+                                "reference": r.get("Summary", "")
                             })
                         logger.info(f"[{session_id}] ILC dataset loaded - {len(raw_samples)} samples")
 
@@ -226,7 +299,8 @@ async def run_pipeline(
                         for i, r in enumerate(ds):
                             raw_samples.append({
                                 "id": f"inabs_{i}",
-                                "input_text": r.get("text", "")
+                                "input_text": r.get("text", ""),
+                                "reference": r.get("summary", "")
                             })
                         logger.info(f"[{session_id}] IN-ABS dataset loaded - {len(raw_samples)} samples")
 
@@ -240,41 +314,137 @@ async def run_pipeline(
 
             # ================= COMMON PIPELINE =================
             logger.info(f"[{session_id}] Starting pipeline with {len(raw_samples)} samples")
-            save_json(session_path / "raw.json", raw_samples)
-
-            update("Cleaning Started")
-            logger.info(f"[{session_id}] Running cleaner script...")
-            run_script(
-                SCRIPTS_DIR / "cleaner_generic.py",
-                ["--input", "raw.json", "--output", "cleaned.json"],
-                session_path
-            )
-            update("Cleaning Completed")
-
-            update("LegalBERT Extractive Started")
-            logger.info(f"[{session_id}] Running LegalBERT extractive script...")
-            run_script(
-                SCRIPTS_DIR / "legalbert_extractive.py",
-                ["--input", "cleaned.json", "--output", "legalbert.json"],
-                session_path
-            )
-            update("LegalBERT Extractive Completed")
-
-            update("T5 Abstractive Started")
-            logger.info(f"[{session_id}] Running T5 abstractive script...")
-            run_script(
-                SCRIPTS_DIR / "t5_abstractive.py",
-                ["--input", "legalbert.json", "--output", "final.json"],
-                session_path
-            )
-            update("T5 Abstractive Completed")
+
+            # Score each summary against its dataset reference as it completes
+            references = {s["id"]: s["reference"] for s in raw_samples if s.get("reference")}
+            for reference in references.values():
+                ROUGE_EVALUATOR.reference(reference)
+            running_rouge = RunningRouge()
+            sample_rouge = {}
+
+            def score_result(record):
+                reference = references.get(record["id"])
+                if reference is None or record["id"] in sample_rouge:
+                    return
+                try:
+                    scores = ROUGE_EVALUATOR.score(reference, record["summary_text"])
+                except Exception as e:
+                    logger.warning(f"[{session_id}] ROUGE scoring failed: {e}")
+                    return
+                sample_rouge[record["id"]] = {m: round(s.fmeasure * 100, 2) for m, s in scores.items()}
+                running_rouge.add(scores)
+                if session_id in PIPELINE_PROGRESS:
+                    PIPELINE_PROGRESS[session_id]["rouge"] = running_rouge.summary()
+            store.save("raw", raw_samples)
+
+            if not STREAMING_PIPELINE:
+                update("Cleaning Started")
+                logger.info(f"[{session_id}] Running cleaner script...")
+                run_script(
+                    SCRIPTS_DIR / "cleaner_generic.py",
+                    ["--input", store.name("raw"), "--output", store.name("cleaned")],
+                    session_path
+                )
+                update("Cleaning Completed")
+
+            # Model stages wait for a free inference slot so concurrent
+            # sessions split the cores instead of oversubscribing them
+            slot = FREE_SLOTS.get()
+            try:
+                env = worker_env(slot, INFERENCE_SLOTS, pin=PIN_CPU_AFFINITY)
+                logger.info(f"[{session_id}] Using inference slot {slot}")
+
+                profile = decoding_profile
+                bert_args = ["--backend", LEGALBERT_BACKEND]
+                worker_args = []
+                if mode == "dataset" and DATASET_WORKERS > 1:
+                    worker_args = [
+                        "--workers", str(DATASET_WORKERS), "--pool-timeout", WORKER_POOL_TIMEOUT
+                    ]
+                    if MMAP_MODEL_WEIGHTS:
+                        worker_args.append("--mmap-weights")
+
+                # Fit profile and extract size to what is left of the latency budget
+                if deadline is not None:
+                    if STREAMING_PIPELINE:
+                        # Nothing is cleaned yet; raw word counts are a close upper bound
+                        doc_words = [len(s["input_text"].split()) for s in raw_samples]
+                    else:
+                        doc_words = [len(s["text"].split()) for s in store.load("cleaned")]
+                    plan = plan_for_budget(
+                        deadline.remaining(), doc_words, decoding_profile,
+                        workers=DATASET_WORKERS if worker_args else 1
+                    )
+                    profile = plan["profile"]
+                    if plan["token_budget"]:
+                        bert_args += ["--token-budget", str(plan["token_budget"])]
+                    if session_id in PIPELINE_PROGRESS:
+                        PIPELINE_PROGRESS[session_id]["plan"] = plan
+                    logger.info(f"[{session_id}] Latency plan: {plan}")
+
+                t5_args = ["--profile", profile]
+                if T5_INT8:
+                    t5_args.append("--int8")
+                if deadline is not None:
+                    t5_args += ["--deadline", str(deadline.at)]
+                if references:
+                    t5_args.append("--report-results")
+
+                if STREAMING_PIPELINE:
+                    update("Streaming Pipeline Started")
+                    logger.info(f"[{session_id}] Running streaming pipeline script...")
+                    run_script(
+                        SCRIPTS_DIR / "streaming_pipeline.py",
+                        ["--input", store.name("raw"), "--output", store.name("final")]
+                        + bert_args + t5_args,
+                        session_path,
+                        env,
+                        on_result=score_result
+                    )
+                    update("Streaming Pipeline Completed")
+                else:
+                    update("LegalBERT Extractive Started")
+                    logger.info(f"[{session_id}] Running LegalBERT extractive script...")
+                    run_script(
+                        SCRIPTS_DIR / "legalbert_extractive.py",
+                        ["--input", store.name("cleaned"), "--output", store.name("legalbert")]
+                        + bert_args + worker_args,
+                        session_path,
+                        env
+                    )
+                    update("LegalBERT Extractive Completed")
+
+                    update("T5 Abstractive Started")
+                    logger.info(f"[{session_id}] Running T5 abstractive script...")
+                    run_script(
+                        SCRIPTS_DIR / "t5_abstractive.py",
+                        ["--input", store.name("legalbert"), "--output", store.name("final")]
+                        + t5_args + worker_args,
+                        session_path,
+                        env,
+                        on_result=score_result
+                    )
+                    update("T5 Abstractive Completed")
+            finally:
+                FREE_SLOTS.put(slot)
 
             logger.info(f"[{session_id}] Loading results...")
             if session_id in PIPELINE_PROGRESS:
-                PIPELINE_PROGRESS[session_id]["results"] = load_json(
-                    session_path / "final.json"
+                results = store.load("final")
+                for r in results:
+                    score_result(r)
+                    if r["id"] in sample_rouge:
+                        r["rouge"] = sample_rouge[r["id"]]
+                if export_json:
+                    for stage in (["raw", "final"] if STREAMING_PIPELINE else PIPELINE_STAGES):
+                        store.export_json(stage)
+                session = PIPELINE_PROGRESS[session_id]
+                session["results"] = results
+                session["degraded"] = bool(
+                    (session["plan"] and session["plan"]["degraded"])
+                    or any(r.get("degraded") for r in results)
                 )
-                PIPELINE_PROGRESS[session_id]["completed"] = True
+                session["completed"] = True
                 logger.info(f"[{session_id}] Pipeline completed successfully")
 
         except Exception as e:
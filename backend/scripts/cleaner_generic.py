@@ -5,10 +5,28 @@ import os
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.insert(0, PROJECT_ROOT)
 
-import json
 import argparse
 from pathlib import Path
 from src.cleaner import clean_text
+from src.intermediate_store import read_records, write_records
+
+def clean_samples(data):
+    """
+    Cleans raw records. The output is aligned with ``data``; records that
+    clean down to nothing come back as None.
+    """
+    cleaned = []
+    for item in data:
+        text = clean_text(item["input_text"], aggressive=False)
+        if not text.strip():
+            cleaned.append(None)
+            continue
+        record = {"id": item["id"], "text": text}
+        # Dataset references ride along to the final records for scoring
+        if "reference" in item:
+            record["reference"] = item["reference"]
+        cleaned.append(record)
+    return cleaned
 
 def main():
     parser = argparse.ArgumentParser()
@@ -19,20 +37,11 @@ def main():
     input_path = Path(args.input)
     output_path = Path(args.output)
 
-    with open(input_path, encoding="utf-8") as f:
-        data = json.load(f)
+    data = read_records(input_path)
 
-    cleaned = []
-    for item in data:
-        text = clean_text(item["input_text"], aggressive=False)
-        if text.strip():
-            cleaned.append({
-                "id": item["id"],
-                "text": text
-            })
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(cleaned, f, indent=2, ensure_ascii=False)
+    cleaned = [item for item in clean_samples(data) if item is not None]
+
+    write_records(output_path, cleaned)
 
     print(f"Cleaned data saved to {output_path}")
 
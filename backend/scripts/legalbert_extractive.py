@@ -1,8 +1,6 @@
-import json
-import torch
 import argparse
-import re
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from contextlib import nullcontext
+from transformers import AutoTokenizer
 from tqdm import tqdm
 import sys, os
 
@@ -10,60 +8,134 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..
 sys.path.insert(0, PROJECT_ROOT)
 
 from pathlib import Path
+from src.legalbert_scorer import (
+    CachedScorer, PooledScorer, load_scorer, split_into_sentences, BACKENDS, DEFAULT_BATCH_SIZE,
+    ONNX_SUBDIR
+)
+from src.intermediate_store import read_records, write_records
+from src.lexical_scorer import lexical_scores, prefilter_sentences
+from src.runtime_config import configure_runtime
+from src.worker_pool import add_pool_arguments
+from src.score_cache import PersistentLRUCache, model_fingerprint
+from src.selection import select_by_ratio, select_by_token_budget
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 LEGALBERT_PATH = PROJECT_ROOT / "finetuned_legalbert_classifier"
+SCORE_CACHE_PATH = PROJECT_ROOT / "backend" / "cache" / "legalbert_scores.sqlite"
+SCORE_CACHE_MAX_ENTRIES = 1_000_000   # one float per sentence; roughly 100MB on disk
+T5_TOKENIZER_NAME = "t5-base"     # budgets are counted in T5-stage tokens
 
 
+def add_stage_arguments(parser):
+    parser.add_argument("--ratio", type=float, default=0.6)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    parser.add_argument("--cache-path", default=str(SCORE_CACHE_PATH))
+    parser.add_argument("--cache-max-entries", type=int, default=SCORE_CACHE_MAX_ENTRIES)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument(
+        "--token-budget", type=int, default=None,
+        help="keep the best sentences that fit in this many T5 tokens, in document order "
+             "(overrides --ratio)"
+    )
+    parser.add_argument(
+        "--prefilter-threshold", type=int, default=None,
+        help="drop sentences whose lexical score is below this before LegalBERT scoring"
+    )
+
+
+def open_score_cache(scorer, args):
+    """
+    Wraps ``scorer`` with the persistent score cache unless --no-cache.
+    """
+    if args.no_cache:
+        return scorer, None
+    # Keyed by model fingerprint so a retrained or re-exported model starts fresh;
+    # the torch backend never reads the exported graphs, so re-exporting keeps its scores
+    exclude = [ONNX_SUBDIR] if args.backend == "torch" else []
+    fingerprint = model_fingerprint(LEGALBERT_PATH, args.backend, exclude=exclude)
+    cache = PersistentLRUCache(args.cache_path, max_disk_entries=args.cache_max_entries)
+    return CachedScorer(scorer, cache, fingerprint), cache
+
+
+def load_budget_tokenizer(args):
+    if args.token_budget:
+        return AutoTokenizer.from_pretrained(T5_TOKENIZER_NAME)
+    return None
+
+
+def extract_samples(data, scorer, args, t5_tokenizer=None):
+    """
+    Selects the extractive summary of each sample. The output is aligned
+    with ``data``; samples without usable sentences come back as None.
+    """
+    samples = [
+        prefilter_sentences(split_into_sentences(sample["text"]), args.prefilter_threshold)
+        for sample in data
+    ]
+    scored = [i for i, sents in enumerate(samples) if sents]
+
+    # Pool sentences across documents so short documents share full batches
+    all_scores = scorer.score_documents([samples[i] for i in scored])
+
+    results = [None] * len(data)
+    for i, probs in zip(scored, all_scores):
+        sample, sents = data[i], samples[i]
+
+        # A document the LegalBERT workers kept failing on falls back to
+        # lexical scores instead of failing the whole run
+        degraded = probs is None
+        if degraded:
+            probs = lexical_scores(sents).tolist()
+
+        if t5_tokenizer is not None:
+            counts = [len(ids) for ids in t5_tokenizer(sents, add_special_tokens=False)["input_ids"]]
+            selected = select_by_token_budget(sents, probs, counts, args.token_budget)
+        else:
+            selected = select_by_ratio(sents, probs, args.ratio)
+
+        results[i] = {
+            "id": sample["id"],
+            "text": " ".join(selected),
+            "degraded": degraded
+        }
+        if "reference" in sample:
+            results[i]["reference"] = sample["reference"]
+    return results
 
-def split_into_sentences(text):
-    return [s.strip() for s in re.split(r'(?<=[.!?])\s+', text) if len(s.strip()) > 20]
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", required=True)
     parser.add_argument("--output", required=True)
-    parser.add_argument("--ratio", type=float, default=0.6)
+    add_stage_arguments(parser)
+    add_pool_arguments(parser)
     args = parser.parse_args()
 
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-
-    tokenizer = AutoTokenizer.from_pretrained(LEGALBERT_PATH)
-    model = AutoModelForSequenceClassification.from_pretrained(
-        LEGALBERT_PATH
-    ).to(device)
-    model.eval()
+    configure_runtime()
 
-    with open(args.input, encoding="utf-8") as f:
-        data = json.load(f)
+    t5_tokenizer = load_budget_tokenizer(args)
 
-    results = []
+    if args.workers > 1:
+        model_scorer = PooledScorer(
+            LEGALBERT_PATH, args.backend, batch_size=args.batch_size,
+            workers=args.workers, pin=args.pin_workers, timeout=args.pool_timeout,
+            mmap_weights=args.mmap_weights
+        )
+    else:
+        model_scorer = nullcontext(load_scorer(LEGALBERT_PATH, args.backend, batch_size=args.batch_size))
 
-    for sample in tqdm(data, desc="LegalBERT extractive"):
-        sents = split_into_sentences(sample["text"])
-        if not sents:
-            continue
+    data = read_records(args.input)
 
-        enc = tokenizer(
-            sents, padding=True, truncation=True,
-            max_length=128, return_tensors="pt"
-        ).to(device)
+    with model_scorer as scorer:
+        scorer, cache = open_score_cache(scorer, args)
+        results = extract_samples(tqdm(data, desc="LegalBERT extractive"), scorer, args, t5_tokenizer)
 
-        with torch.no_grad():
-            probs = torch.softmax(model(**enc).logits, dim=1)[:, 1]
-
-        ranked = sorted(zip(sents, probs), key=lambda x: x[1], reverse=True)
-        keep = max(1, int(len(ranked) * args.ratio))
-
-        extracted = " ".join(s for s, _ in ranked[:keep])
-
-        results.append({
-            "id": sample["id"],
-            "text": extracted
-        })
+    write_records(args.output, [r for r in results if r is not None])
 
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    if cache is not None:
+        print(f"LegalBERT score cache: {cache.stats()}")
+        cache.close()
 
     print(f"LegalBERT output saved to {args.output}")
 
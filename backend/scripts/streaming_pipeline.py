@@ -0,0 +1,78 @@
+import argparse
+import sys
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import legalbert_extractive
+import t5_abstractive
+from cleaner_generic import clean_samples
+from src.intermediate_store import read_records, write_records
+from src.legalbert_scorer import load_scorer
+from src.pipeline_executor import DEFAULT_QUEUE_SIZE, Stage, StreamingPipeline, report_result
+from src.runtime_config import configure_runtime
+
+# Documents handed to LegalBERT at once; sentences are pooled across them
+EXTRACTIVE_BATCH_DOCUMENTS = 8
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cleaning, LegalBERT extraction and T5 summarization in one process, "
+                    "with the stages overlapping on a stream of documents"
+    )
+    parser.add_argument("--input", required=True)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE)
+    legalbert_extractive.add_stage_arguments(parser)
+    t5_abstractive.add_stage_arguments(parser)
+    parser.set_defaults(mmap_weights=False)
+    args = parser.parse_args()
+
+    configure_runtime()
+
+    scorer = load_scorer(legalbert_extractive.LEGALBERT_PATH, args.backend, batch_size=args.batch_size)
+    scorer, cache = legalbert_extractive.open_score_cache(scorer, args)
+    t5_tokenizer = legalbert_extractive.load_budget_tokenizer(args)
+    t5_stage = t5_abstractive.load_stage(args)
+
+    def progress(stage, done):
+        print(f"[{stage}] {done} documents", flush=True)
+
+    def summarize(batch):
+        results = t5_abstractive.summarize_samples(t5_stage, batch)
+        if args.report_results:
+            for result in results:
+                report_result({"id": result["id"], "summary_text": result["summary_text"]})
+        return results
+
+    pipeline = StreamingPipeline([
+        Stage("Cleaning", clean_samples),
+        Stage(
+            "LegalBERT Extractive",
+            lambda batch: legalbert_extractive.extract_samples(batch, scorer, args, t5_tokenizer),
+            batch_size=EXTRACTIVE_BATCH_DOCUMENTS
+        ),
+        Stage("T5 Abstractive", summarize),
+    ], queue_size=args.queue_size, on_progress=progress)
+
+    results = pipeline.run(read_records(args.input))
+    write_records(args.output, results)
+
+    for name, seconds in pipeline.stage_seconds.items():
+        print(f"{name}: {seconds:.1f}s busy")
+
+    if cache is not None:
+        print(f"LegalBERT score cache: {cache.stats()}")
+        cache.close()
+    memo = t5_stage["memo"]
+    if memo is not None:
+        print(f"T5 chunk memo: {memo.cache.stats()}")
+        memo.cache.close()
+
+    print(f"Summaries saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
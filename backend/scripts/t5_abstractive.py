@@ -1,30 +1,38 @@
-import json
 import argparse
 import torch
 import re
-from transformers import T5ForConditionalGeneration, T5Tokenizer
-from peft import PeftModel
+from transformers import T5TokenizerFast
 from tqdm import tqdm
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 # ================= PATHS =================
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.chunking import chunk_by_sentences
+from src.deadline import Deadline
+from src.intermediate_store import read_records, write_records
+from src.keywords import KeywordIndex
+from src.pipeline_executor import report_result
+from src.decoding_profiles import DECODING_PROFILES, DEFAULT_PROFILE, generation_kwargs
+from src.runtime_config import configure_runtime
+from src.score_cache import PersistentLRUCache, model_fingerprint
+from src.t5_generation import ChunkMemo, summarize_batch, tree_reduce, DEFAULT_MAX_BATCH_TOKENS
+from src.t5_model import load_t5_model
+from src.worker_pool import ModelWorkerPool, add_pool_arguments
+
 T5_BASE_NAME = "t5-base"
 T5_ADAPTER_PATH = PROJECT_ROOT / "finetuned_t5_qlora"
+T5_MERGED_PATH = PROJECT_ROOT / "finetuned_t5_merged"     # built by scripts/merge_t5_adapter.py
+CHUNK_MEMO_PATH = PROJECT_ROOT / "backend" / "cache" / "t5_chunk_summaries.sqlite"
 
 # ================= CONFIG (SAFE DEFAULTS) =================
 MAX_INPUT_TOKENS = 512          # tokenizer truncation cap
 CHUNK_TOKENS = 300              # CPU/GPU safe
-STAGE1_MAX = 120
-STAGE1_MIN = 60
-FINAL_MAX = 350
-FINAL_MIN = 150
-NUM_BEAMS = 4                   # CPU-friendly
-KEYWORD_SENT_LIMIT = 5
+KEYWORD_SENT_LIMIT = 5          # beams and lengths come from src/decoding_profiles.py
+CHUNK_MEMO_MAX_ENTRIES = 50000
 # =========================================================
 
 KEYWORDS = [
@@ -33,61 +41,15 @@ KEYWORDS = [
     "arbitration", "inherent power", "Full Bench"
 ]
 
+KEYWORD_INDEX = KeywordIndex(KEYWORDS)
+
 # ================= HELPERS =================
 
 def split_into_sentences(text: str) -> List[str]:
     return [s.strip() for s in re.split(r'(?<=[.!?])\s+', text) if s.strip()]
 
 def find_keyword_sentences(text: str, limit: int) -> List[str]:
-    sents = split_into_sentences(text)
-    found = []
-    lowered = [s.lower() for s in sents]
-    for kw in KEYWORDS:
-        for i, s in enumerate(lowered):
-            if kw in s and sents[i] not in found:
-                found.append(sents[i])
-                if len(found) >= limit:
-                    return found
-    return found
-
-def chunk_text_by_tokens(text: str, tokenizer, max_tokens: int) -> List[str]:
-    words = text.split()
-    chunks, current = [], []
-    for w in words:
-        current.append(w)
-        if len(tokenizer.encode(" ".join(current))) >= max_tokens:
-            chunks.append(" ".join(current))
-            current = []
-    if current:
-        chunks.append(" ".join(current))
-    return chunks
-
-def summarize_text(
-    text: str,
-    tokenizer,
-    model,
-    max_length: int,
-    min_length: int,
-    device
-) -> str:
-    enc = tokenizer(
-        "summarize: " + text,
-        return_tensors="pt",
-        truncation=True,
-        max_length=MAX_INPUT_TOKENS
-    ).to(device)
-
-    with torch.no_grad():
-        out = model.generate(
-            **enc,
-            max_length=max_length,
-            min_length=min_length,
-            num_beams=NUM_BEAMS,
-            no_repeat_ngram_size=3,
-            early_stopping=True
-        )
-
-    return tokenizer.decode(out[0], skip_special_tokens=True)
+    return KEYWORD_INDEX.keyword_sentences(text, limit)
 
 # ================= ENDING FIXES (ONLY ADDITION) =================
 
@@ -125,83 +87,195 @@ def stabilize_legal_ending(text: str) -> str:
 
     return text
 
-# ================= MAIN =================
-
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--input", required=True)
-    parser.add_argument("--output", required=True)
-    args = parser.parse_args()
+def summarize_document(
+    text: str,
+    tokenizer,
+    model,
+    device,
+    profile: str = DEFAULT_PROFILE,
+    max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+    memo: Optional[ChunkMemo] = None,
+    deadline: Optional[Deadline] = None
+) -> str:
+    # -------- Stage 1: Chunk-wise summaries --------
+    chunks = chunk_by_sentences(text, tokenizer, CHUNK_TOKENS)
+
+    # Reprocessed documents mostly repeat chunks, so only memo misses are generated
+    generate = memo.summarize if memo is not None else summarize_batch
+
+    def summarize_level(texts, gen_kwargs):
+        return generate(
+            texts,
+            tokenizer,
+            model,
+            device,
+            gen_kwargs,
+            max_input_tokens=MAX_INPUT_TOKENS,
+            max_batch_tokens=max_batch_tokens,
+            deadline=deadline
+        )
 
+    stage1_summaries = [s for s in summarize_level(chunks, generation_kwargs(profile, "stage1")) if s]
+
+    # -------- Stage 2: Optional merge --------
+    # Long documents are reduced level by level so no stage-1 summary is
+    # lost to the input truncation of a single final pass
+    if not stage1_summaries and deadline is not None and chunks:
+        # Deadline passed before any chunk was summarized: fall back to the
+        # leading extractive sentences
+        final_summary = chunks[0]
+    elif len(stage1_summaries) <= 2 or (deadline is not None and deadline.expired()):
+        final_summary = " ".join(stage1_summaries)
+    else:
+        final_summary = tree_reduce(
+            stage1_summaries,
+            tokenizer,
+            summarize_level,
+            generation_kwargs(profile, "stage1"),
+            generation_kwargs(profile, "final"),
+            max_input_tokens=MAX_INPUT_TOKENS
+        ) or " ".join(stage1_summaries)
+
+    # -------- Keyword reinforcement --------
+    keywords = find_keyword_sentences(text, KEYWORD_SENT_LIMIT)
+    prepend = [k for k in keywords if k not in final_summary]
+    if prepend:
+        final_summary = " ".join(prepend) + " " + final_summary
+
+    # -------- ENDING FIX (ONLY CHANGE) --------
+    final_summary = remove_broken_last_sentence(final_summary)
+    final_summary = stabilize_legal_ending(final_summary)
+    final_summary = re.sub(r"\s+", " ", final_summary).strip()
+
+    return final_summary
+
+# ================= STAGE =================
+
+def load_stage(args):
+    """
+    Loads tokenizer, model and chunk memo; runs once per (worker) process.
+    """
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-    tokenizer = T5Tokenizer.from_pretrained(T5_BASE_NAME)
+    tokenizer = T5TokenizerFast.from_pretrained(T5_BASE_NAME)
+
+    model = load_t5_model(
+        T5_BASE_NAME, T5_ADAPTER_PATH, T5_MERGED_PATH, device,
+        int8=args.int8, mmap_weights=args.mmap_weights
+    )
 
-    base_model = T5ForConditionalGeneration.from_pretrained(
-        T5_BASE_NAME,
-        torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32
-    ).to(device)
+    memo = None
+    if not args.no_memo:
+        cache = PersistentLRUCache(
+            args.memo_path, max_memory_entries=1000, max_disk_entries=args.memo_max_entries
+        )
+        fingerprint = model_fingerprint(
+            T5_ADAPTER_PATH, T5_BASE_NAME, "int8" if args.int8 else "fp", device.type
+        )
+        memo = ChunkMemo(cache, fingerprint)
 
-    model = PeftModel.from_pretrained(base_model, T5_ADAPTER_PATH)
-    model.eval()
+    deadline = Deadline(args.deadline) if args.deadline is not None else None
 
-    with open(args.input, encoding="utf-8") as f:
-        data = json.load(f)
+    return dict(args=args, tokenizer=tokenizer, model=model, device=device, memo=memo, deadline=deadline)
 
+def summarize_samples(stage, samples: List[dict]) -> List[dict]:
+    args, deadline = stage["args"], stage["deadline"]
     results = []
+    for sample in samples:
+        final_summary = summarize_document(
+            sample["text"].strip(),
+            stage["tokenizer"],
+            stage["model"],
+            stage["device"],
+            profile=args.profile,
+            max_batch_tokens=args.max_batch_tokens,
+            memo=stage["memo"],
+            deadline=deadline
+        )
 
-    for sample in tqdm(data, desc="T5 hierarchical summarization"):
-        text = sample["text"].strip()
-        if not text:
-            continue
-
-        # -------- Stage 1: Chunk-wise summaries --------
-        chunks = chunk_text_by_tokens(text, tokenizer, CHUNK_TOKENS)
-
-        stage1_summaries = []
-        for chunk in chunks:
-            s = summarize_text(
-                chunk,
-                tokenizer,
-                model,
-                STAGE1_MAX,
-                STAGE1_MIN,
-                device
-            )
-            stage1_summaries.append(s)
-
-        # -------- Stage 2: Optional merge --------
-        if len(stage1_summaries) <= 2:
-            final_summary = " ".join(stage1_summaries)
-        else:
-            combined = " ".join(stage1_summaries)
-            final_summary = summarize_text(
-                combined,
-                tokenizer,
-                model,
-                FINAL_MAX,
-                FINAL_MIN,
-                device
-            )
-
-        # -------- Keyword reinforcement --------
-        keywords = find_keyword_sentences(text, KEYWORD_SENT_LIMIT)
-        prepend = [k for k in keywords if k not in final_summary]
-        if prepend:
-            final_summary = " ".join(prepend) + " " + final_summary
-
-        # -------- ENDING FIX (ONLY CHANGE) --------
-        final_summary = remove_broken_last_sentence(final_summary)
-        final_summary = stabilize_legal_ending(final_summary)
-        final_summary = re.sub(r"\s+", " ", final_summary).strip()
-
-        results.append({
+        result = {
             "id": sample.get("id"),
-            "summary_text": final_summary
-        })
+            "summary_text": final_summary,
+            "decoding_profile": args.profile,
+            "degraded": sample.get("degraded", False) or (deadline is not None and deadline.missed)
+        }
+        if "reference" in sample:
+            result["reference"] = sample["reference"]
+        results.append(result)
+    return results
+
+# ================= MAIN =================
+
+def add_stage_arguments(parser):
+    parser.add_argument(
+        "--max-batch-tokens", type=int, default=DEFAULT_MAX_BATCH_TOKENS,
+        help="memory budget per stage-1 generate call (input tokens x beams)"
+    )
+    parser.add_argument("--int8", action="store_true", help="dynamic int8 inference on CPU")
+    parser.add_argument("--profile", choices=list(DECODING_PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument("--memo-path", default=str(CHUNK_MEMO_PATH))
+    parser.add_argument("--memo-max-entries", type=int, default=CHUNK_MEMO_MAX_ENTRIES)
+    parser.add_argument("--no-memo", action="store_true")
+    parser.add_argument(
+        "--deadline", type=float, default=None,
+        help="unix time by which generation must finish; later work is cut short "
+             "and the affected summaries are flagged as degraded"
+    )
+    parser.add_argument(
+        "--report-results", action="store_true",
+        help="print each summary on stdout as soon as it is done"
+    )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", required=True)
+    parser.add_argument("--output", required=True)
+    add_stage_arguments(parser)
+    add_pool_arguments(parser)
+    args = parser.parse_args()
 
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    configure_runtime()
+
+    data = read_records(args.input)
+
+    data = [sample for sample in data if sample["text"].strip()]
+
+    def report(i, result):
+        report_result({"id": result["id"], "summary_text": result["summary_text"]})
+
+    if args.workers > 1:
+        # One document per task keeps long and short documents balanced
+        with ModelWorkerPool(
+            load_stage, summarize_samples, args.workers,
+            init_args=(args,), pin=args.pin_workers, items_per_task=1,
+            timeout=args.pool_timeout
+        ) as pool:
+            results = pool.map(data, on_output=report if args.report_results else None)
+            for i, reason in pool.failures.items():
+                results[i] = {
+                    "id": data[i].get("id"),
+                    "summary_text": "",
+                    "decoding_profile": args.profile,
+                    "degraded": True,
+                    "error": reason.strip().splitlines()[-1]
+                }
+                if args.report_results:
+                    report(i, results[i])
+        memo = None
+    else:
+        stage = load_stage(args)
+        memo = stage["memo"]
+        results = []
+        for i, sample in enumerate(tqdm(data, desc="T5 hierarchical summarization")):
+            results.append(summarize_samples(stage, [sample])[0])
+            if args.report_results:
+                report(i, results[-1])
+
+    write_records(args.output, results)
+
+    if memo is not None:
+        print(f"T5 chunk memo: {memo.cache.stats()}")
+        memo.cache.close()
 
     print(f"T5 summaries saved to {args.output}")
 
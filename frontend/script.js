@@ -10,6 +10,8 @@ const uploadFile = document.getElementById("uploadFile")
 
 const datasetSelect = document.getElementById("dataset")
 const numEntriesSelect = document.getElementById("numEntries")
+const decodingProfileSelect = document.getElementById("decodingProfile")
+const latencyBudgetSelect = document.getElementById("latencyBudget")
 
 const datasetSection = document.getElementById("datasetSection")
 const uploadSection = document.getElementById("uploadSection")
@@ -310,6 +312,12 @@ if (runBtn) {
 
     const fd = new FormData()
     fd.append("mode", mode)
+    if (decodingProfileSelect) {
+      fd.append("decoding_profile", decodingProfileSelect.value)
+    }
+    if (latencyBudgetSelect && latencyBudgetSelect.value) {
+      fd.append("latency_budget", latencyBudgetSelect.value)
+    }
 
     if (mode === "upload") {
       if (!uploadFile || !uploadFile.files || uploadFile.files.length === 0) {
@@ -366,6 +374,10 @@ if (runBtn) {
   })
 }
 
+function formatRouge(rouge) {
+  return `R-1 ${rouge.rouge1.toFixed(2)} | R-2 ${rouge.rouge2.toFixed(2)} | R-L ${rouge.rougeL.toFixed(2)}`
+}
+
 /* ================= PIPELINE POLLING ================= */
 async function pollPipeline(sessionId) {
   let pollCount = 0
@@ -448,10 +460,20 @@ async function pollPipeline(sessionId) {
 
       // ---------- DISPLAY RESULTS ----------
       let output = ""
+      if (status.degraded) {
+        output += "⚠️ Shortened to fit the time limit; summaries may be less detailed.\n\n"
+      }
+      if (status.rouge && status.rouge.samples) {
+        output += `📊 ROUGE over ${status.rouge.samples} samples: ` + formatRouge(status.rouge) + "\n\n"
+      }
       status.results.forEach((r, idx) => {
         output += `📄 Summary ${idx + 1}:\n`
         output += "─".repeat(60) + "\n"
-        output += (r.summary_text || "No summary generated") + "\n\n"
+        output += (r.summary_text || "No summary generated") + "\n"
+        if (r.rouge) {
+          output += formatRouge(r.rouge) + "\n"
+        }
+        output += "\n"
       })
 
       summaryText.textContent = output.trim()
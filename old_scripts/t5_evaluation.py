@@ -1,5 +1,10 @@
 import json
-from rouge_score import rouge_scorer
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.rouge import RougeEvaluator
 
 # ===== FILE PATHS =====
 extractive_path = 'data/t5_ilc_final.json'  # Candidate/refined summaries
@@ -31,7 +36,7 @@ print(f"Missing in reference file: {sorted(missing_in_ref)}\n")
 reference_dict = {entry['id']: entry['summary_text'] for entry in reference_data if 'summary_text' in entry}
 
 # ===== ROUGE SETUP =====
-scorer = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
+scorer = RougeEvaluator(['rouge1', 'rouge2', 'rougeL'])
 scores = {'rouge1': [], 'rouge2': [], 'rougeL': []}
 
 processed = skipped_no_candidate = skipped_no_ref = 0
@@ -5,6 +5,13 @@ from typing import List
 import re
 from tqdm import tqdm
 import time
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.keywords import KeywordIndex
 
 # ===== CONFIG =====
 INPUT_PATH = "data/cleaned_inabs.json"
@@ -35,21 +42,10 @@ KEYWORDS = [
     'tribunal', 'appeal', 'supreme court', 'judgment', 'petition'
 ]
 
-def split_into_sentences(text: str) -> List[str]:
-    sents = re.split(r'(?<=[.!?])\s+', text.strip())
-    return [s.strip() for s in sents if s.strip()]
+KEYWORD_INDEX = KeywordIndex(KEYWORDS)
 
 def find_keyword_sentences(text: str, limit: int) -> List[str]:
-    sents = split_into_sentences(text)
-    found = []
-    lowered = [s.lower() for s in sents]
-    for kw in KEYWORDS:
-        for i, s in enumerate(lowered):
-            if kw in s and sents[i] not in found:
-                found.append(sents[i])
-                if len(found) >= limit:
-                    return found
-    return found
+    return KEYWORD_INDEX.keyword_sentences(text, limit)
 
 def summarize_text_batch(batch_texts: List[str], max_length: int, min_length: int = 10) -> List[str]:
     enc = tokenizer(["summarize: " + t for t in batch_texts],
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from transformers import T5Tokenizer, T5TokenizerFast
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.chunking import chunk_by_sentences
+
+# ==================================
+# CONFIG
+# ==================================
+VAL_PATH = "data/val_dataset.json"
+MODEL_NAME = "t5-base"
+CHUNK_TOKENS = 300
+WORD_COUNTS = [5_000, 20_000, 50_000]
+
+
+def legacy_chunk_text_by_tokens(text, tokenizer, max_tokens):
+    # Previous backend chunker: re-encodes the growing chunk after every word
+    words = text.split()
+    chunks, current = [], []
+    for w in words:
+        current.append(w)
+        if len(tokenizer.encode(" ".join(current))) >= max_tokens:
+            chunks.append(" ".join(current))
+            current = []
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def make_judgment(sentences, n_words):
+    words, out = 0, []
+    while words < n_words:
+        s = random.choice(sentences)
+        out.append(s)
+        words += len(s.split())
+    return " ".join(out)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--val", default=VAL_PATH)
+    parser.add_argument("--skip-legacy-above", type=int, default=50_000,
+                        help="skip the slow legacy chunker for larger inputs")
+    args = parser.parse_args()
+
+    random.seed(42)
+    with open(args.val, encoding="utf-8") as f:
+        data = json.load(f)
+    sentences = [s for d in data for s in d["text"].split(". ") if len(s.split()) > 3]
+
+    slow = T5Tokenizer.from_pretrained(MODEL_NAME)
+    fast = T5TokenizerFast.from_pretrained(MODEL_NAME)
+
+    print(f"{'words':>7} {'legacy s':>9} {'chunks':>7} {'new s':>7} {'chunks':>7} {'speedup':>8}")
+    for n_words in WORD_COUNTS:
+        text = make_judgment(sentences, n_words)
+
+        new_chunks, t_new = timed(chunk_by_sentences, text, fast, CHUNK_TOKENS)
+        if n_words <= args.skip_legacy_above:
+            old_chunks, t_old = timed(legacy_chunk_text_by_tokens, text, slow, CHUNK_TOKENS)
+            print(f"{n_words:>7} {t_old:>9.2f} {len(old_chunks):>7} {t_new:>7.3f} "
+                  f"{len(new_chunks):>7} {t_old / t_new:>7.1f}x")
+        else:
+            print(f"{n_words:>7} {'-':>9} {'-':>7} {t_new:>7.3f} {len(new_chunks):>7} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.runtime_config import configure_runtime, slot_cpus, threads_per_slot
+
+# ==================================
+# CONFIG
+# ==================================
+VAL_PATH = "data/val_dataset.json"
+MODEL_PATH = "finetuned_legalbert_classifier"
+SESSION_COUNTS = [1, 2, 4, 8]
+SENTENCES_PER_SESSION = 512
+
+
+def session_worker(slot, sessions, allotted, pin, sents, barrier, results):
+    if allotted:
+        os.environ["TOKENIZERS_PARALLELISM"] = "false"
+        configure_runtime(
+            threads=threads_per_slot(sessions),
+            interop_threads=1,
+            affinity=slot_cpus(slot, sessions) if pin else None,
+        )
+
+    from src.legalbert_scorer import load_scorer
+
+    scorer = load_scorer(MODEL_PATH, "torch")
+    scorer.score_sentences(sents[:8])   # warm-up
+
+    barrier.wait()
+    start = time.perf_counter()
+    scorer.score_sentences(sents)
+    results.put(time.perf_counter() - start)
+
+
+def run_sessions(sessions, allotted, pin, sents):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(sessions)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=session_worker, args=(i, sessions, allotted, pin, sents, barrier, results))
+        for i in range(sessions)
+    ]
+    for p in procs:
+        p.start()
+    elapsed = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    # All sessions start together, so the slowest one bounds the wall time
+    return sessions * len(sents) / max(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--val", default=VAL_PATH)
+    parser.add_argument("--pin", action="store_true", help="pin each session to its own cores")
+    args = parser.parse_args()
+
+    from src.legalbert_scorer import split_into_sentences
+
+    with open(args.val, encoding="utf-8") as f:
+        data = json.load(f)
+    sents = [s for d in data for s in split_into_sentences(d["text"])][:SENTENCES_PER_SESSION]
+
+    print(f"CPUs: {os.cpu_count()} | Sentences per session: {len(sents)}\n")
+    print(f"{'sessions':>8} {'default sents/s':>16} {'allotted sents/s':>17} {'gain':>6}")
+    for sessions in SESSION_COUNTS:
+        default = run_sessions(sessions, False, False, sents)
+        allotted = run_sessions(sessions, True, args.pin, sents)
+        print(f"{sessions:>8} {default:>16.1f} {allotted:>17.1f} {allotted / default:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.intermediate_store import available_formats, open_store
+
+# ==================================
+# CONFIG
+# ==================================
+VAL_PATH = "data/val_dataset.json"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--val", default=VAL_PATH)
+    parser.add_argument("--copies", type=int, default=10, help="repeat the data to mimic a large run")
+    args = parser.parse_args()
+
+    with open(args.val, encoding="utf-8") as f:
+        records = [{"id": str(i), "text": d["text"]} for i, d in enumerate(json.load(f))] * args.copies
+
+    print(f"Records: {len(records)}\n")
+    print(f"{'format':<8} {'write ms':>9} {'read ms':>9} {'size MB':>8}")
+    with tempfile.TemporaryDirectory() as root:
+        for fmt in available_formats() + ["memory"]:
+            store = open_store(root, fmt)
+            start = time.perf_counter()
+            store.save("cleaned", records)
+            written = time.perf_counter()
+            store.load("cleaned")
+            read = time.perf_counter()
+            size = 0.0 if fmt == "memory" else os.path.getsize(os.path.join(root, store.name("cleaned"))) / 1e6
+            print(f"{fmt:<8} {(written - start) * 1000:>9.1f} {(read - written) * 1000:>9.1f} {size:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
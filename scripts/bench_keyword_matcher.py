@@ -0,0 +1,81 @@
+import os
+import random
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.keywords import KeywordIndex
+
+# ==================================
+# CONFIG
+# ==================================
+KEYWORDS = [
+    "mediation", "conciliation", "fir", "settlement", "agreed",
+    "section", "sections", "498a", "323", "354", "504",
+    "arbitration", "settlement agreement", "inherent power",
+    "full bench", "tribunal", "appeal", "supreme court",
+    "judgment", "petition"
+]
+LIMIT = 5
+SENTENCE_COUNTS = [1_000, 10_000, 50_000]
+FILLER = (
+    "The learned counsel for the respondent submitted that the evidence on record "
+    "was not properly appreciated by the courts below"
+).split()
+
+
+def legacy_find_keyword_sentences(text, limit):
+    # Previous implementation: one pass per keyword and list-based dedup
+    sents = [s.strip() for s in re.split(r'(?<=[.!?])\s+', text) if s.strip()]
+    found = []
+    lowered = [s.lower() for s in sents]
+    for kw in KEYWORDS:
+        for i, s in enumerate(lowered):
+            if kw in s and sents[i] not in found:
+                found.append(sents[i])
+                if len(found) >= limit:
+                    return found
+    return found
+
+
+def make_document(n_sentences, keyword_rate):
+    sents = []
+    for _ in range(n_sentences):
+        words = random.sample(FILLER, 12)
+        if random.random() < keyword_rate:
+            words.insert(random.randrange(len(words)), random.choice(KEYWORDS))
+        sents.append(" ".join(words).capitalize() + ".")
+    return " ".join(sents)
+
+
+def timed(fn, *args, runs=3):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    random.seed(42)
+    index = KeywordIndex(KEYWORDS)
+
+    # Sparse keywords force the legacy loop to walk every sentence per keyword;
+    # a large limit exercises the list-based dedup
+    print(f"{'sentences':>9} {'kw rate':>8} {'limit':>6} {'legacy ms':>10} {'index ms':>9} {'speedup':>8}")
+    for n in SENTENCE_COUNTS:
+        for rate, limit in [(0.001, LIMIT), (0.3, LIMIT), (0.3, n)]:
+            text = make_document(n, rate)
+            old, t_old = timed(legacy_find_keyword_sentences, text, limit)
+            new, t_new = timed(index.keyword_sentences, text, limit)
+            assert old == new, "index disagrees with legacy matcher"
+            print(f"{n:>9} {rate:>8} {limit:>6} {t_old * 1000:>10.1f} {t_new * 1000:>9.1f} "
+                  f"{t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
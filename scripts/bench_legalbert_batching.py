@@ -0,0 +1,82 @@
+import argparse
+import os
+import sys
+import time
+
+from datasets import load_dataset
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.cleaner import clean_text
+from src.legalbert_scorer import LegalBertScorer, load_scorer, split_into_sentences, BACKENDS
+
+# ==================================
+# CONFIG
+# ==================================
+MODEL_PATH = "finetuned_legalbert_classifier"
+
+DATASETS = {
+    "ILC": ("d0r1h/ILC", "Case"),
+    "IN-ABS": ("percins/IN-ABS", "text"),
+}
+
+# Documents are bucketed by sentence count to show throughput per size class
+SIZE_BUCKETS = [(0, 20), (20, 100), (100, 10 ** 9)]
+
+
+def load_documents(name: str, n: int):
+    repo, field = DATASETS[name]
+    ds = load_dataset(repo, split=f"train[:{n}]")
+    docs = [split_into_sentences(clean_text(r.get(field, ""))) for r in ds]
+    return [d for d in docs if d]
+
+
+def bench_per_document(scorer: LegalBertScorer, docs) -> float:
+    # Baseline: one forward pass per document, as the extractive stage used to run
+    start = time.perf_counter()
+    for sents in docs:
+        enc = scorer.tokenizer(
+            sents, padding=True, truncation=True,
+            max_length=128, return_tensors="pt"
+        )
+        scorer._forward(enc)
+    return time.perf_counter() - start
+
+
+def bench_pooled(scorer: LegalBertScorer, docs) -> float:
+    start = time.perf_counter()
+    scorer.score_documents(docs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    args = parser.parse_args()
+
+    scorer = load_scorer(MODEL_PATH, args.backend, batch_size=args.batch_size)
+
+    print(f"{'dataset':<8} {'bucket':<12} {'docs':>5} {'sents':>7} "
+          f"{'per-doc s/s':>12} {'pooled s/s':>11} {'speedup':>8}")
+
+    for name in DATASETS:
+        docs = load_documents(name, args.n)
+        for lo, hi in SIZE_BUCKETS + [(0, 10 ** 9)]:
+            bucket = [d for d in docs if lo <= len(d) < hi]
+            if not bucket:
+                continue
+            n_sents = sum(len(d) for d in bucket)
+
+            t_doc = bench_per_document(scorer, bucket)
+            t_pool = bench_pooled(scorer, bucket)
+
+            label = "all" if hi == 10 ** 9 and lo == 0 else f"{lo}-{hi if hi < 10 ** 9 else 'inf'}"
+            print(f"{name:<8} {label:<12} {len(bucket):>5} {n_sents:>7} "
+                  f"{n_sents / t_doc:>12.1f} {n_sents / t_pool:>11.1f} {t_doc / t_pool:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
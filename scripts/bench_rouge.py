@@ -0,0 +1,54 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from rouge_score import rouge_scorer
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rouge import ROUGE_METRICS, average_fmeasure, evaluate
+
+# ==================================
+# CONFIG
+# ==================================
+PRED_PATH = "data/t5_val_predictions.json"
+
+
+def rouge_score_baseline(pairs):
+    scorer = rouge_scorer.RougeScorer(ROUGE_METRICS, use_stemmer=True)
+    scores = [scorer.score(ref, pred) for ref, pred in pairs]
+    return {m: sum(s[m].fmeasure for s in scores) / len(scores) * 100 for m in ROUGE_METRICS}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pred", default=PRED_PATH)
+    parser.add_argument("--repeat", type=int, default=1, help="repeat the pairs to simulate a larger run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with open(args.pred, encoding="utf-8") as f:
+        data = [d for d in json.load(f) if d["reference"] and d["prediction"]]
+    pairs = [(d["reference"], d["prediction"]) for d in data] * args.repeat
+
+    print(f"Pairs: {len(pairs)} | Workers: {args.workers}\n")
+    print(f"{'engine':<12} {'seconds':>8} {'pairs/s':>9} {'R-1':>6} {'R-2':>6} {'R-L':>6}")
+
+    runs = [
+        ("rouge_score", lambda: rouge_score_baseline(pairs)),
+        ("serial", lambda: average_fmeasure(evaluate(pairs))),
+        ("pool", lambda: average_fmeasure(evaluate(pairs, workers=args.workers))),
+    ]
+    for name, run in runs:
+        start = time.perf_counter()
+        avg = run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12} {elapsed:>8.2f} {len(pairs) / elapsed:>9.1f} "
+              + " ".join(f"{avg[m]:>6.2f}" for m in ROUGE_METRICS))
+
+
+if __name__ == "__main__":
+    main()
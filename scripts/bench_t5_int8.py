@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import torch
+from rouge_score import rouge_scorer
+from transformers import T5TokenizerFast
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "backend", "scripts"))
+
+from src.t5_generation import DEFAULT_MAX_BATCH_TOKENS
+from src.t5_model import load_t5_model
+from t5_abstractive import summarize_document, T5_BASE_NAME, T5_ADAPTER_PATH, T5_MERGED_PATH
+
+# ==================================
+# CONFIG
+# ==================================
+INPUT_PATH = "data/val_extractive_legalbert_classifier.json"
+
+
+def run(model, tokenizer, data, max_batch_tokens=DEFAULT_MAX_BATCH_TOKENS):
+    device = torch.device("cpu")
+    preds = []
+
+    start = time.perf_counter()
+    for sample in data:
+        summary = summarize_document(
+            sample["text"], tokenizer, model, device, max_batch_tokens=max_batch_tokens
+        )
+        preds.append(summary)
+    elapsed = time.perf_counter() - start
+
+    # Chunk and reduce passes generate far more tokens than the final summary
+    # holds, so throughput is reported per document rather than per token
+    return preds, len(data) / elapsed, elapsed
+
+
+def rouge_f1(refs, preds):
+    scorer = rouge_scorer.RougeScorer(["rouge1", "rouge2", "rougeL"], use_stemmer=True)
+    totals = {"rouge1": 0.0, "rouge2": 0.0, "rougeL": 0.0}
+    for ref, pred in zip(refs, preds):
+        s = scorer.score(ref, pred)
+        for k in totals:
+            totals[k] += s[k].fmeasure
+    return {k: v / len(refs) * 100 for k, v in totals.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", default=INPUT_PATH)
+    parser.add_argument("--n", type=int, default=None, help="limit the number of samples")
+    parser.add_argument(
+        "--diff-unbatched", action="store_true",
+        help="also generate one chunk per call and report summaries that differ from batched output"
+    )
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        data = [d for d in json.load(f) if d["text"].strip()]
+    data = data[:args.n] if args.n else data
+    refs = [d["summary"] for d in data]
+
+    tokenizer = T5TokenizerFast.from_pretrained(T5_BASE_NAME)
+    device = torch.device("cpu")
+
+    print(f"Samples: {len(data)} | CPU threads: {torch.get_num_threads()}\n")
+    print(f"{'mode':<6} {'docs/s':>7} {'total s':>8} {'R-1':>6} {'R-2':>6} {'R-L':>6}")
+
+    for mode in ["fp32", "int8"]:
+        model = load_t5_model(
+            T5_BASE_NAME, T5_ADAPTER_PATH, T5_MERGED_PATH, device, int8=(mode == "int8")
+        )
+        preds, docs_s, elapsed = run(model, tokenizer, data)
+        scores = rouge_f1(refs, preds)
+        print(f"{mode:<6} {docs_s:>7.3f} {elapsed:>8.1f} "
+              f"{scores['rouge1']:>6.2f} {scores['rouge2']:>6.2f} {scores['rougeL']:>6.2f}")
+
+        if args.diff_unbatched:
+            # A one-token budget puts every chunk in a batch of its own
+            single, _, single_elapsed = run(model, tokenizer, data, max_batch_tokens=1)
+            differ = [i for i, (a, b) in enumerate(zip(preds, single)) if a != b]
+            print(f"{'':<6} batch size 1: {single_elapsed:.1f}s | "
+                  f"{len(differ)}/{len(preds)} summaries differ from batched output {differ[:10]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+from argparse import Namespace
+
+import psutil
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "backend", "scripts"))
+
+from src.legalbert_scorer import _score_documents, load_scorer
+from src.worker_pool import ModelWorkerPool
+
+# ==================================
+# CONFIG
+# ==================================
+MODEL_PATH = "finetuned_legalbert_classifier"
+SAMPLE_TEXT = (
+    "The appellant challenged the order of the High Court under Section 482 of the Code. "
+    "The respondent contended that the petition was not maintainable."
+)
+MB = 1024 * 1024
+
+
+def start_pool(stage, workers, mmap_weights):
+    if stage == "legalbert":
+        pool = ModelWorkerPool(
+            load_scorer, _score_documents, workers,
+            init_args=(MODEL_PATH, "torch", 8, mmap_weights), items_per_task=1
+        )
+        pool.map([[SAMPLE_TEXT]] * workers)
+        return pool
+
+    from t5_abstractive import load_stage, summarize_samples
+    from src.decoding_profiles import DEFAULT_PROFILE
+    from src.t5_generation import DEFAULT_MAX_BATCH_TOKENS
+
+    stage_args = Namespace(
+        int8=False, mmap_weights=mmap_weights, no_memo=True, deadline=None,
+        profile=DEFAULT_PROFILE, max_batch_tokens=DEFAULT_MAX_BATCH_TOKENS
+    )
+    pool = ModelWorkerPool(load_stage, summarize_samples, workers, init_args=(stage_args,), items_per_task=1)
+    pool.map([{"id": i, "text": SAMPLE_TEXT} for i in range(workers)])
+    return pool
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stage", choices=["legalbert", "t5"], default="t5")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    # RSS counts shared pages in every process; PSS splits them between the
+    # sharers and USS is what each worker holds on its own
+    print(f"Stage: {args.stage} | Workers: {args.workers}\n")
+    print(f"{'weights':<8} {'RSS/worker MB':>14} {'USS/worker MB':>14} {'PSS total MB':>13}")
+    for mmap_weights in (False, True):
+        with start_pool(args.stage, args.workers, mmap_weights) as pool:
+            mem = [psutil.Process(pid).memory_full_info() for pid in pool.pids]
+        rss = sum(m.rss for m in mem) / len(mem) / MB
+        uss = sum(m.uss for m in mem) / len(mem) / MB
+        pss = sum(m.pss for m in mem) / MB
+        label = "mmap" if mmap_weights else "private"
+        print(f"{label:<8} {rss:>14.0f} {uss:>14.0f} {pss:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
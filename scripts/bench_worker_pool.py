@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import sys
+import time
+from argparse import Namespace
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "backend", "scripts"))
+
+from src.legalbert_scorer import PooledScorer, load_scorer, split_into_sentences
+from src.worker_pool import ModelWorkerPool
+
+# ==================================
+# CONFIG
+# ==================================
+VAL_PATH = "data/val_dataset.json"
+EXTRACTIVE_PATH = "data/val_extractive_legalbert_classifier.json"
+MODEL_PATH = "finetuned_legalbert_classifier"
+WORKER_COUNTS = [1, 2, 4, 8]
+DOCUMENTS = {"legalbert": 64, "t5": 16}
+
+
+def bench_legalbert(workers, data, pin):
+    documents = [split_into_sentences(d["text"]) for d in data]
+    if workers == 1:
+        scorer = load_scorer(MODEL_PATH, "torch")
+        start = time.perf_counter()
+        scorer.score_documents(documents)
+        return time.perf_counter() - start
+
+    with PooledScorer(MODEL_PATH, "torch", workers=workers, pin=pin) as scorer:
+        scorer.score_sentences(documents[0][:8])   # warm-up, waits for model loading
+        start = time.perf_counter()
+        scorer.score_documents(documents)
+        return time.perf_counter() - start
+
+
+def bench_t5(workers, data, pin):
+    from t5_abstractive import load_stage, summarize_samples
+    from src.decoding_profiles import DEFAULT_PROFILE
+    from src.t5_generation import DEFAULT_MAX_BATCH_TOKENS
+
+    # Same options as a backend run, without the memo so every run generates
+    stage_args = Namespace(
+        int8=False, mmap_weights=False, no_memo=True, deadline=None, profile=DEFAULT_PROFILE,
+        max_batch_tokens=DEFAULT_MAX_BATCH_TOKENS
+    )
+    if workers == 1:
+        stage = load_stage(stage_args)
+        start = time.perf_counter()
+        summarize_samples(stage, data)
+        return time.perf_counter() - start
+
+    with ModelWorkerPool(
+        load_stage, summarize_samples, workers, init_args=(stage_args,), pin=pin, items_per_task=1
+    ) as pool:
+        pool.map(data[:workers])    # warm-up, waits for model loading
+        start = time.perf_counter()
+        pool.map(data)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stage", choices=["legalbert", "t5"], default="legalbert")
+    parser.add_argument("--input", default=None, help="defaults to the stage's validation input")
+    parser.add_argument("--pin", action="store_true", help="pin each worker to its own cores")
+    args = parser.parse_args()
+
+    path = args.input or (VAL_PATH if args.stage == "legalbert" else EXTRACTIVE_PATH)
+    with open(path, encoding="utf-8") as f:
+        data = [d for d in json.load(f) if d["text"].strip()][:DOCUMENTS[args.stage]]
+    bench = bench_legalbert if args.stage == "legalbert" else bench_t5
+
+    print(f"Stage: {args.stage} | CPUs: {os.cpu_count()} | Documents: {len(data)}\n")
+    print(f"{'workers':>7} {'docs/s':>8} {'scaling':>8}")
+
+    base = None
+    for workers in WORKER_COUNTS:
+        elapsed = bench(workers, data, args.pin)
+        base = base or elapsed
+        print(f"{workers:>7} {len(data) / elapsed:>8.2f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,80 @@
+import argparse
 import json
+import os
 import re
-from rouge_score import rouge_scorer
+import sys
+from itertools import islice
+from multiprocessing import get_context
+
 from tqdm import tqdm
 
-INPUT_PATH = "data/train_dataset.json"   # same file used for T5
-OUTPUT_PATH = "data/legalbert_sentence_data.json"
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.dataset_shards import iter_split
+from src.rouge import RougeEvaluator, rouge1_fmeasures, tokenize
+
+SHARDS_DIR = "data/train_shards"         # same train split used for T5
+OUTPUT_PATH = "data/legalbert_sentence_data.jsonl"
+LABEL_THRESHOLD = 0.25                   # threshold used in literature
+MIN_SENTENCE_CHARS = 20
+DOCUMENTS_PER_SHARD = 16
+
+_evaluator = None
 
-scorer = rouge_scorer.RougeScorer(["rouge1"], use_stemmer=True)
 
 def split_into_sentences(text):
     sents = re.split(r'(?<=[.!?])\s+', text.strip())
-    return [s.strip() for s in sents if len(s.strip()) > 20]
+    return [s.strip() for s in sents if len(s.strip()) > MIN_SENTENCE_CHARS]
+
+
+def label_documents(shard):
+    """
+    Labeled rows for a shard of documents. Each summary is tokenized once
+    and all of its document's sentences are scored together.
+    """
+    global _evaluator
+    if _evaluator is None:
+        _evaluator = RougeEvaluator(["rouge1"])
 
-dataset = []
+    rows = []
+    for text, summary in shard:
+        sentences = split_into_sentences(text)
+        if not sentences:
+            continue
+        reference = _evaluator.reference(summary)
+        scores = rouge1_fmeasures(reference, [tokenize(s) for s in sentences])
+        rows.extend(
+            {"sentence": sent, "label": int(score >= LABEL_THRESHOLD)}
+            for sent, score in zip(sentences, scores)
+        )
+    # Summaries are not shared between documents, so don't let them pile up
+    _evaluator.references.clear()
+    return rows
 
-with open(INPUT_PATH, encoding="utf-8") as f:
-    data = json.load(f)
 
-for sample in tqdm(data, desc="Building sentence dataset"):
-    text = sample["text"]
-    summary = sample["summary"]
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shards", default=SHARDS_DIR)
+    parser.add_argument("--output", default=OUTPUT_PATH, help="JSON Lines, one labeled sentence per line")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
 
-    sentences = split_into_sentences(text)
+    documents = ((d["text"], d["summary"]) for d in iter_split(args.shards, "train"))
+    shards = iter(lambda: list(islice(documents, DOCUMENTS_PER_SHARD)), [])
 
-    for sent in sentences:
-        score = scorer.score(summary, sent)["rouge1"].fmeasure
-        label = 1 if score >= 0.25 else 0   # threshold used in literature
+    n_rows = n_positive = 0
+    with open(args.output, "w", encoding="utf-8") as out, \
+            get_context("spawn").Pool(args.workers) as pool:
+        # Rows are written as shards finish, in input order
+        for rows in tqdm(pool.imap(label_documents, shards), desc="Building sentence dataset (shards)"):
+            for row in rows:
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            n_rows += len(rows)
+            n_positive += sum(row["label"] for row in rows)
 
-        dataset.append({
-            "sentence": sent,
-            "label": label
-        })
+    print(f"Saved {n_rows} sentences ({n_positive} positive) → {args.output}")
 
-with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-    json.dump(dataset, f, indent=2, ensure_ascii=False)
 
-print(f"Saved sentence classification dataset → {OUTPUT_PATH}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.legalbert_scorer import load_scorer, split_into_sentences, ONNX_MODEL_FILES
+
+# ==================================
+# CONFIG
+# ==================================
+VAL_PATH = "data/val_dataset.json"
+MODEL_PATH = "finetuned_legalbert_classifier"
+EXTRACTIVE_RATIO = 0.6
+
+
+def top_k(scores, k):
+    return set(sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:k])
+
+
+def timed_scores(scorer, docs):
+    start = time.perf_counter()
+    scores = scorer.score_documents(docs)
+    return scores, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--val", default=VAL_PATH)
+    parser.add_argument("--backend", choices=list(ONNX_MODEL_FILES), default="onnx-int8")
+    parser.add_argument("--ratio", type=float, default=EXTRACTIVE_RATIO)
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    with open(args.val, encoding="utf-8") as f:
+        data = json.load(f)
+    docs = [d for d in (split_into_sentences(s["text"]) for s in data) if d]
+
+    ref_scores, ref_time = timed_scores(load_scorer(MODEL_PATH, "torch"), docs)
+    cand_scores, cand_time = timed_scores(load_scorer(MODEL_PATH, args.backend), docs)
+
+    agreements, max_diff = [], 0.0
+    for ref, cand in zip(ref_scores, cand_scores):
+        k = max(1, int(len(ref) * args.ratio))
+        agreements.append(len(top_k(ref, k) & top_k(cand, k)) / k)
+        max_diff = max(max_diff, max(abs(a - b) for a, b in zip(ref, cand)))
+
+    mean_agreement = sum(agreements) / len(agreements)
+    n_sents = sum(len(d) for d in docs)
+
+    print(f"Documents: {len(docs)} | Sentences: {n_sents}")
+    print(f"Top-k agreement (mean): {mean_agreement * 100:.2f}%")
+    print(f"Top-k agreement (min):  {min(agreements) * 100:.2f}%")
+    print(f"Max |prob difference|:  {max_diff:.4f}")
+    print(f"torch: {n_sents / ref_time:.1f} sents/s | {args.backend}: "
+          f"{n_sents / cand_time:.1f} sents/s | speedup {ref_time / cand_time:.2f}x")
+
+    if mean_agreement < args.min_agreement:
+        print(f"❌ Agreement below {args.min_agreement * 100:.0f}%")
+        sys.exit(1)
+    print("✅ Backend agrees with the PyTorch model")
+
+
+if __name__ == "__main__":
+    main()
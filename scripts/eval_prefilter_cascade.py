@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from rouge_score import rouge_scorer
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.legalbert_scorer import load_scorer, split_into_sentences, BACKENDS
+from src.lexical_scorer import prefilter_sentences
+from src.selection import select_by_ratio
+
+# ==================================
+# CONFIG
+# ==================================
+VAL_PATH = "data/val_dataset.json"
+MODEL_PATH = "finetuned_legalbert_classifier"
+EXTRACTIVE_RATIO = 0.6
+THRESHOLDS = [None, 1, 2, 3, 4, 5]
+
+
+def run_cascade(scorer, docs, threshold, ratio):
+    filtered = [prefilter_sentences(sents, threshold) for sents in docs]
+
+    start = time.perf_counter()
+    scores = scorer.score_documents(filtered)
+    elapsed = time.perf_counter() - start
+
+    extracts = [" ".join(select_by_ratio(s, p, ratio)) for s, p in zip(filtered, scores)]
+    n_scored = sum(len(s) for s in filtered)
+    return extracts, n_scored, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--val", default=VAL_PATH)
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    parser.add_argument("--ratio", type=float, default=EXTRACTIVE_RATIO)
+    args = parser.parse_args()
+
+    with open(args.val, encoding="utf-8") as f:
+        data = json.load(f)
+    data = [d for d in data if split_into_sentences(d["text"])]
+    docs = [split_into_sentences(d["text"]) for d in data]
+    refs = [d["summary"] for d in data]
+    total_sents = sum(len(d) for d in docs)
+
+    scorer = load_scorer(MODEL_PATH, args.backend)
+    rouge = rouge_scorer.RougeScorer(["rouge1", "rouge2", "rougeL"], use_stemmer=True)
+
+    print(f"Documents: {len(docs)} | Sentences: {total_sents}\n")
+    print(f"{'threshold':>9} {'scored':>8} {'kept %':>7} {'bert s':>7} "
+          f"{'speedup':>8} {'R-1':>6} {'R-2':>6} {'R-L':>6}")
+
+    baseline_time = None
+    for threshold in THRESHOLDS:
+        extracts, n_scored, elapsed = run_cascade(scorer, docs, threshold, args.ratio)
+        if baseline_time is None:
+            baseline_time = elapsed
+
+        totals = {"rouge1": 0.0, "rouge2": 0.0, "rougeL": 0.0}
+        for ref, pred in zip(refs, extracts):
+            s = rouge.score(ref, pred)
+            for k in totals:
+                totals[k] += s[k].fmeasure
+
+        label = "off" if threshold is None else str(threshold)
+        print(f"{label:>9} {n_scored:>8} {n_scored / total_sents * 100:>6.1f}% {elapsed:>7.2f} "
+              f"{baseline_time / elapsed:>7.2f}x "
+              + " ".join(f"{totals[k] / len(refs) * 100:>6.2f}" for k in totals))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,62 @@
+import argparse
 import json
-from rouge_score import rouge_scorer
+import os
+import sys
+import time
 
-# ======================================
-# CONFIG
-# ======================================
-PRED_PATH = "data/t5_val_predictions.json"   
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
 
-# ======================================
-# LOAD DATA
-# ======================================
-with open(PRED_PATH, encoding="utf-8") as f:
-    data = json.load(f)
+from src.intermediate_store import write_records
+from src.rouge import ROUGE_METRICS, average_fmeasure, evaluate, per_sample_records
 
-print(f"Loaded {len(data)} predictions")
-
-# ======================================
-# ROUGE SETUP
 # ======================================
-scorer = rouge_scorer.RougeScorer(
-    ["rouge1", "rouge2", "rougeL"],
-    use_stemmer=True
-)
-
-scores = {
-    "rouge1": [],
-    "rouge2": [],
-    "rougeL": []
-}
-
-# ======================================
-# SCORE LOOP
-# ======================================
-for item in data:
-    reference = item["reference"]
-    prediction = item["prediction"]
-
-    if not reference or not prediction:
-        continue
-
-    s = scorer.score(reference, prediction)
-    scores["rouge1"].append(s["rouge1"].fmeasure)
-    scores["rouge2"].append(s["rouge2"].fmeasure)
-    scores["rougeL"].append(s["rougeL"].fmeasure)
-
-# ======================================
-# RESULTS
+# CONFIG
 # ======================================
-print("\nROUGE F1 scores:")
-for k in scores:
-    avg = sum(scores[k]) / len(scores[k]) if scores[k] else 0
-    print(f"{k}: {avg * 100:.2f}%")
-
+PRED_PATH = "data/t5_val_predictions.json"
+SCORES_PATH = "data/t5_val_rouge_scores.json"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pred", default=PRED_PATH)
+    parser.add_argument(
+        "--scores-out", default=SCORES_PATH,
+        help="per-sample scores; the format follows the extension (.json, .arrow, .msgpack)"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    # ======================================
+    # LOAD DATA
+    # ======================================
+    with open(args.pred, encoding="utf-8") as f:
+        data = json.load(f)
+
+    print(f"Loaded {len(data)} predictions")
+
+    data = [item for item in data if item["reference"] and item["prediction"]]
+    pairs = [(item["reference"], item["prediction"]) for item in data]
+
+    # ======================================
+    # SCORE
+    # ======================================
+    start = time.perf_counter()
+    scores = evaluate(pairs, ROUGE_METRICS, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    ids = [item.get("id", i) for i, item in enumerate(data)]
+    write_records(args.scores_out, per_sample_records(ids, scores))
+
+    # ======================================
+    # RESULTS
+    # ======================================
+    print(f"Scored {len(scores)} pairs in {elapsed:.2f}s ({args.workers} workers)")
+    print("\nROUGE F1 scores:")
+    for k, avg in average_fmeasure(scores).items():
+        print(f"{k}: {avg:.2f}%")
+    print(f"\nPer-sample scores saved to {args.scores_out}")
+
+
+if __name__ == "__main__":
+    main()
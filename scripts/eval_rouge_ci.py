@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rouge import ROUGE_METRICS, evaluate
+from src.rouge_stats import (
+    DEFAULT_CONFIDENCE, DEFAULT_RESAMPLES, bootstrap_ci, paired_bootstrap, permutation_test
+)
+
+# ======================================
+# CONFIG
+# ======================================
+PRED_PATH = "data/t5_val_predictions.json"
+
+
+def load_predictions(path):
+    """
+    {id: (reference, prediction)} for a predictions file in the format
+    written by scripts/infer_t5_two_stage_val.py.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        item.get("id", i): (item["reference"], item["prediction"])
+        for i, item in enumerate(data) if item["reference"]
+    }
+
+
+def fmeasures(pairs, workers):
+    """
+    (samples x metrics) array of F-measures in percent.
+    """
+    scores = evaluate(pairs, ROUGE_METRICS, workers=workers)
+    return np.array([[s[m].fmeasure * 100 for m in ROUGE_METRICS] for s in scores])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bootstrap confidence intervals for ROUGE, and paired significance "
+                    "tests between two prediction files"
+    )
+    parser.add_argument("--pred", default=PRED_PATH)
+    parser.add_argument("--compare", default=None, help="second prediction file over the same samples")
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES)
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    a = load_predictions(args.pred)
+    systems = {args.pred: a}
+    if args.compare:
+        b = load_predictions(args.compare)
+        # Paired tests need both systems on the same samples
+        ids = [i for i in a if i in b]
+        if len(ids) < len(a) or len(ids) < len(b):
+            print(f"Comparing the {len(ids)} samples present in both files")
+        systems = {args.pred: {i: a[i] for i in ids}, args.compare: {i: b[i] for i in ids}}
+
+    start = time.perf_counter()
+    scores = {
+        path: fmeasures(list(preds.values()), args.workers)
+        for path, preds in systems.items()
+    }
+
+    level = f"{args.confidence * 100:.0f}%"
+    for path, f in scores.items():
+        print(f"\n{path} ({len(f)} samples, {level} CI, {args.resamples} resamples)")
+        for k, metric in enumerate(ROUGE_METRICS):
+            ci = bootstrap_ci(f[:, k], args.resamples, args.confidence, args.seed)
+            print(f"{metric:<7} {ci['mean']:6.2f}  [{ci['low']:6.2f}, {ci['high']:6.2f}]")
+
+    if args.compare:
+        fa, fb = scores.values()
+        print(f"\nDifference ({args.pred}) - ({args.compare})")
+        print(f"{'metric':<7} {'diff':>6}  {level + ' CI':>16}  {'p (bootstrap)':>13}  {'p (permutation)':>15}")
+        for k, metric in enumerate(ROUGE_METRICS):
+            paired = paired_bootstrap(fa[:, k], fb[:, k], args.resamples, args.confidence, args.seed)
+            p_perm = permutation_test(fa[:, k], fb[:, k], args.resamples, args.seed)
+            print(f"{metric:<7} {paired['diff']:>+6.2f}  [{paired['low']:+6.2f}, {paired['high']:+6.2f}]  "
+                  f"{paired['p_value']:>13.4f}  {p_perm:>15.4f}")
+
+    print(f"\nDone in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
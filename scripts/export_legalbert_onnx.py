@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.legalbert_scorer import ONNX_SUBDIR, ONNX_MODEL_FILES
+
+# ==================================
+# CONFIG
+# ==================================
+MODEL_PATH = "finetuned_legalbert_classifier"
+OPSET = 17
+
+
+class LogitsOnly(torch.nn.Module):
+    """
+    Wraps the classifier so the exported graph takes named inputs and returns logits.
+    """
+
+    def __init__(self, model, input_names):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        return self.model(**dict(zip(self.input_names, inputs))).logits
+
+
+def export(model_path: Path, out_path: Path):
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+
+    dummy = tokenizer(
+        ["The appeal is dismissed.", "Section 302 of the Indian Penal Code applies."],
+        padding=True, return_tensors="pt"
+    )
+    input_names = list(dummy.keys())
+    dynamic_axes = {k: {0: "batch", 1: "sequence"} for k in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            LogitsOnly(model, input_names),
+            tuple(dummy[k] for k in input_names),
+            str(out_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=OPSET,
+        )
+    print(f"Exported ONNX model → {out_path}")
+
+
+def quantize(fp32_path: Path, int8_path: Path):
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    print(f"Saved int8 dynamic-quantized model → {int8_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--quantize", action="store_true", help="also write a dynamic int8 model")
+    args = parser.parse_args()
+
+    model_path = Path(args.model)
+    onnx_dir = model_path / ONNX_SUBDIR
+    fp32_path = onnx_dir / ONNX_MODEL_FILES["onnx"]
+
+    export(model_path, fp32_path)
+    if args.quantize:
+        quantize(fp32_path, onnx_dir / ONNX_MODEL_FILES["onnx-int8"])
+
+
+if __name__ == "__main__":
+    main()
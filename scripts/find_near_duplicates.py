@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import islice
+from multiprocessing import get_context
+
+import numpy as np
+from tqdm import tqdm
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from prepare_training_data import SOURCES, iter_samples
+from src.near_duplicates import DEFAULT_THRESHOLD, MinHasher, cluster_report, duplicate_clusters
+
+REPORT_PATH = "data/near_duplicates.json"
+DOCUMENTS_PER_TASK = 64
+
+_hasher = None
+
+
+def sign_batch(texts):
+    global _hasher
+    if _hasher is None:
+        _hasher = MinHasher()
+    return _hasher.signatures(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate judgments across the cleaned ILC and IN-ABS datasets"
+    )
+    parser.add_argument("--output", default=REPORT_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="estimated Jaccard similarity")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    uids, sources = [], []
+
+    def texts():
+        # Texts go to the workers in batches; only ids and signatures are kept
+        samples = iter_samples(SOURCES)
+        while True:
+            batch = list(islice(samples, DOCUMENTS_PER_TASK))
+            if not batch:
+                return
+            uids.extend(s["uid"] for s in batch)
+            sources.extend(s["source"] for s in batch)
+            yield [s["text"] for s in batch]
+
+    start = time.perf_counter()
+    with get_context("spawn").Pool(args.workers) as pool:
+        signatures = np.concatenate(list(tqdm(pool.imap(sign_batch, texts()), desc="MinHash (batches)")))
+    clusters = duplicate_clusters(signatures, args.threshold)
+    report = cluster_report(uids, sources, clusters)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        f"Documents: {report['documents']} | Clusters: {len(report['clusters'])} "
+        f"({report['cross_source_clusters']} across datasets) | "
+        f"Documents in clusters: {report['documents_in_clusters']} | {time.perf_counter() - start:.1f}s\n"
+        f"Report saved → {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,36 @@
+import argparse
 import json
+import os
 import random
+import sys
 
-DATA_PATH = "data/train_dataset.json"
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.dataset_shards import iter_split
+
+SHARDS_DIR = "data/train_shards"     # written by scripts/prepare_training_data.py
 VAL_PATH = "data/val_dataset.json"
+VAL_SIZE = 30
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shards", default=SHARDS_DIR)
+    parser.add_argument("--output", default=VAL_PATH)
+    parser.add_argument("--n", type=int, default=VAL_SIZE)
+    args = parser.parse_args()
+
+    # Sampled from the hash-assigned val split, so none of it is trained on
+    random.seed(42)
+    val = list(iter_split(args.shards, "val"))
+    val = random.sample(val, min(args.n, len(val)))
 
-random.seed(42)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(val, f, indent=2, ensure_ascii=False)
 
-data = json.load(open(DATA_PATH, encoding="utf-8"))
-val = random.sample(data, 30)
+    print(f"Saved {len(val)} validation samples")
 
-with open(VAL_PATH, "w", encoding="utf-8") as f:
-    json.dump(val, f, indent=2, ensure_ascii=False)
 
-print(f"Saved {len(val)} validation samples")
+if __name__ == "__main__":
+    main()
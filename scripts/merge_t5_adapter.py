@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+import time
+
+import torch
+from transformers import T5ForConditionalGeneration, T5TokenizerFast
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.t5_model import adapter_hash, merge_adapter, merged_is_current
+
+# ==================================
+# CONFIG
+# ==================================
+MODEL_NAME = "t5-base"
+ADAPTER_PATH = "finetuned_t5_qlora"
+MERGED_PATH = "finetuned_t5_merged"
+SAMPLE_TEXT = (
+    "summarize: The appellant was convicted under Section 302 of the Indian Penal Code. "
+    "The High Court confirmed the conviction and the appellant approached this Court."
+)
+
+
+def time_per_token(model, tokenizer, runs=3):
+    enc = tokenizer(SAMPLE_TEXT, return_tensors="pt")
+    with torch.no_grad():
+        model.generate(**enc, max_new_tokens=8)   # warm-up
+        start = time.perf_counter()
+        tokens = 0
+        for _ in range(runs):
+            out = model.generate(**enc, max_new_tokens=64, min_new_tokens=64, num_beams=1)
+            tokens += out.shape[1]
+    return (time.perf_counter() - start) / tokens
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--adapter", default=ADAPTER_PATH)
+    parser.add_argument("--output", default=MERGED_PATH)
+    parser.add_argument("--force", action="store_true")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare load time and per-token latency against base + adapter")
+    args = parser.parse_args()
+
+    if merged_is_current(args.output, args.adapter) and not args.force:
+        print(f"Merged checkpoint in {args.output} is up to date")
+    else:
+        merge_adapter(MODEL_NAME, args.adapter, args.output)
+        T5TokenizerFast.from_pretrained(MODEL_NAME).save_pretrained(args.output)
+        print(f"Saved merged checkpoint → {args.output} (adapter {adapter_hash(args.adapter)})")
+
+    if not args.benchmark:
+        return
+
+    from peft import PeftModel
+
+    tokenizer = T5TokenizerFast.from_pretrained(MODEL_NAME)
+
+    start = time.perf_counter()
+    adapter_model = PeftModel.from_pretrained(
+        T5ForConditionalGeneration.from_pretrained(MODEL_NAME), args.adapter
+    ).eval()
+    adapter_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    merged_model = T5ForConditionalGeneration.from_pretrained(args.output).eval()
+    merged_load = time.perf_counter() - start
+
+    adapter_tok = time_per_token(adapter_model, tokenizer)
+    merged_tok = time_per_token(merged_model, tokenizer)
+
+    print(f"\n{'':<16} {'load s':>8} {'ms/token':>9}")
+    print(f"{'base + adapter':<16} {adapter_load:>8.2f} {adapter_tok * 1000:>9.2f}")
+    print(f"{'merged':<16} {merged_load:>8.2f} {merged_tok * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
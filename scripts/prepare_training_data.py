@@ -1,43 +1,77 @@
+import argparse
 import json
+import os
+import sys
 
-# Load cleaned datasets
-with open("data/cleaned_ilc.json", encoding="utf-8") as f:
-    ilc = json.load(f)
-
-with open("data/cleaned_inabs.json", encoding="utf-8") as f:
-    inabs = json.load(f)
-
-output = []
-
-# -----------------------------
-# Process ILC
-# -----------------------------
-for idx, sample in enumerate(ilc):
-    output.append({
-        "uid": f"ilc_{idx:06d}",
-        "source": "ilc",
-        "text": sample["input_text"],
-        "summary": sample["summary_text"]
-    })
-
-# -----------------------------
-# Process IN-ABS
-# -----------------------------
-for idx, sample in enumerate(inabs):
-    output.append({
-        "uid": f"inabs_{idx:06d}",
-        "source": "inabs",
-        "text": sample["input_text"],
-        "summary": sample["summary_text"]
-    })
-
-# -----------------------------
-# Save merged dataset
-# -----------------------------
-with open("data/train_dataset.json", "w", encoding="utf-8") as f:
-    json.dump(output, f, indent=2, ensure_ascii=False)
-
-print(
-    f"Saved merged training dataset → data/train_dataset.json\n"
-    f"ILC samples: {len(ilc)} | IN-ABS samples: {len(inabs)} | Total: {len(output)}"
-)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.dataset_shards import DEFAULT_SHARD_BYTES, SHARD_FORMATS, iter_records, write_shards
+from src.near_duplicates import excluded_uids
+
+# Cleaned datasets, merged in this order
+SOURCES = {
+    "ilc": "data/cleaned_ilc.json",
+    "inabs": "data/cleaned_inabs.json",
+}
+OUTPUT_DIR = "data/train_shards"
+VAL_FRACTION = 0.05
+
+
+def iter_samples(sources):
+    for source, path in sources.items():
+        for idx, sample in enumerate(iter_records(path)):
+            yield {
+                "uid": f"{source}_{idx:06d}",
+                "source": source,
+                "text": sample["input_text"],
+                "summary": sample["summary_text"]
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge the cleaned datasets into deduplicated, sharded train/val splits"
+    )
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--format", choices=list(SHARD_FORMATS), default="jsonl")
+    parser.add_argument(
+        "--val-fraction", type=float, default=VAL_FRACTION,
+        help="share of texts assigned to val, by hash of the text"
+    )
+    parser.add_argument("--shard-mb", type=float, default=DEFAULT_SHARD_BYTES / (1024 * 1024))
+    parser.add_argument(
+        "--near-duplicates", default=None,
+        help="report from scripts/find_near_duplicates.py; its clusters are kept out of the splits"
+    )
+    parser.add_argument(
+        "--near-duplicate-policy", choices=["keep-one", "drop-all"], default="keep-one",
+        help="keep one member of each cluster, or drop whole clusters"
+    )
+    args = parser.parse_args()
+
+    exclude = None
+    if args.near_duplicates:
+        with open(args.near_duplicates, encoding="utf-8") as f:
+            exclude = excluded_uids(json.load(f), args.near_duplicate_policy)
+
+    manifest = write_shards(
+        iter_samples(SOURCES), args.output_dir, fmt=args.format,
+        val_fraction=args.val_fraction, max_bytes=int(args.shard_mb * 1024 * 1024),
+        exclude=exclude
+    )
+
+    counts = " | ".join(f"{source}: {n}" for source, n in manifest["sources"].items())
+    splits = " | ".join(
+        f"{split}: {s['records']} in {len(s['shards'])} shards" for split, s in manifest["splits"].items()
+    )
+    print(
+        f"Saved sharded training dataset → {args.output_dir}\n"
+        f"{counts} | Duplicates dropped: {manifest['duplicates_dropped']} | "
+        f"Near-duplicates excluded: {manifest['excluded']}\n"
+        f"{splits}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,13 @@ from typing import List
 import re
 from tqdm import tqdm
 import time
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.keywords import KEYWORDS, KeywordIndex
 
 # ==================================
 # CONFIG
@@ -54,13 +61,10 @@ model.eval()
 # ==================================
 # LEGAL KEYWORDS (expanded)
 # ==================================
-KEYWORDS = [
-    "held that", "it is held", "it is observed", "accordingly",
-    "appeal is dismissed", "appeal is allowed", "petition is dismissed",
-    "section", "sections", "FIR", "settlement", "arbitration",
-    "inherent power", "supreme court", "high court", "tribunal",
-    "judgment", "order"
-]
+# KeywordIndex scans each document once per keyword with str.find;
+# count_keywords checks the keywords one at a time against the lowered text
+KEYWORD_INDEX = KeywordIndex(KEYWORDS)
+JUDGMENT_INDEX = KeywordIndex(["appeal", "petition", "dismissed", "allowed"])
 
 # ==================================
 # HELPERS
@@ -70,11 +74,8 @@ def split_into_sentences(text: str) -> List[str]:
     return [s.strip() for s in sents if s.strip()]
 
 def score_sentence(sent: str) -> int:
-    score = 0
+    score = 3 * KEYWORD_INDEX.count_keywords(sent)
     lower = sent.lower()
-    for kw in KEYWORDS:
-        if kw in lower:
-            score += 3
     if re.search(r"\b(section|sec\.?)\s+\d+", lower):
         score += 2
     if len(sent.split()) > 20:
@@ -140,10 +141,7 @@ def two_stage_summarize(text: str) -> str:
     final = summarize_batch([combined], FINAL_SUM_MAX, FINAL_MIN_LEN)[0]
 
     # Explicit judgment sentence injection
-    judgment_sents = [
-        s for s in split_into_sentences(text)
-        if any(k in s.lower() for k in ["appeal", "petition", "dismissed", "allowed"])
-    ]
+    judgment_sents = JUDGMENT_INDEX.matching_sentences(text)
 
     prepend = judgment_sents[:KEYWORD_SENT_LIMIT]
     if prepend:
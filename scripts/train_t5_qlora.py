@@ -1,6 +1,9 @@
 # train_t5_qlora.py
 
-import json
+import os
+import sys
+from itertools import islice
+
 import torch
 from datasets import Dataset
 from transformers import (
@@ -17,8 +20,12 @@ from peft import (
     prepare_model_for_kbit_training
 )
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.dataset_shards import iter_split
+
 MODEL_NAME = "t5-base"
-TRAIN_PATH = "data/train_dataset.json"
+TRAIN_SHARDS = "data/train_shards"   # written by scripts/prepare_training_data.py
 
 MAX_INPUT_LENGTH = 384          # 512 WILL OOM
 MAX_TARGET_LENGTH = 196
@@ -36,10 +43,7 @@ OUTPUT_DIR = "finetuned_t5_qlora"
 # LOAD DATA
 # =====================================================
 print("\nLoading dataset...")
-with open(TRAIN_PATH, encoding="utf-8") as f:
-    data = json.load(f)
-
-data = data[:SAMPLE_SIZE]
+data = list(islice(iter_split(TRAIN_SHARDS, "train"), SAMPLE_SIZE))
 dataset = Dataset.from_list(data)
 
 print(f"Loaded {len(dataset)} samples")
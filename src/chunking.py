@@ -0,0 +1,81 @@
+# src/chunking.py
+
+import re
+from typing import List, Tuple
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Returns (start, end) character spans of the sentences in ``text``.
+    """
+    spans, start = [], 0
+    for m in SENTENCE_BOUNDARY.finditer(text):
+        if m.start() > start:
+            spans.append((start, m.start()))
+        start = m.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+def _sentence_units(text: str, offsets, max_tokens: int) -> List[Tuple[int, int, int]]:
+    """
+    Maps tokens onto sentences in a single pass and returns (start, end, n_tokens)
+    units. Sentences longer than ``max_tokens`` are split at token boundaries.
+    """
+    spans = sentence_spans(text)
+    token_ranges = [[None, 0] for _ in spans]   # first token index, token count
+
+    j = 0
+    for t, (s, e) in enumerate(offsets):
+        if e <= s:
+            continue   # special or empty tokens carry no text
+        while j < len(spans) - 1 and spans[j][1] <= s:
+            j += 1
+        if token_ranges[j][0] is None:
+            token_ranges[j][0] = t
+        token_ranges[j][1] += 1
+
+    units = []
+    for (start, end), (first, count) in zip(spans, token_ranges):
+        if count <= max_tokens:
+            units.append((start, end, count))
+            continue
+        for a in range(first, first + count, max_tokens):
+            b = min(a + max_tokens, first + count)
+            piece_start = start if a == first else offsets[a][0]
+            piece_end = end if b == first + count else offsets[b][0]
+            units.append((piece_start, piece_end, b - a))
+    return units
+
+
+def chunk_by_sentences(text: str, tokenizer, max_tokens: int) -> List[str]:
+    """
+    Packs whole sentences into chunks of at most ``max_tokens`` tokens.
+
+    The document is tokenized once with a fast tokenizer and the offset
+    mapping assigns tokens to sentences, so the cost is linear in the
+    document length. Consecutive sentences are packed greedily, which gives
+    the fewest chunks for an order-preserving split.
+    """
+    if not text.strip():
+        return []
+
+    enc = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+    units = _sentence_units(text, enc["offset_mapping"], max_tokens)
+
+    chunks, chunk_start, chunk_end, used = [], None, None, 0
+    for start, end, n in units:
+        if chunk_start is not None and used + n > max_tokens:
+            chunks.append(text[chunk_start:chunk_end].strip())
+            chunk_start, used = None, 0
+        if chunk_start is None:
+            chunk_start = start
+        chunk_end = end
+        used += n
+    if chunk_start is not None:
+        chunks.append(text[chunk_start:chunk_end].strip())
+
+    return [c for c in chunks if c]
@@ -0,0 +1,185 @@
+# src/dataset_shards.py
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.intermediate_store import read_records, write_records
+from src.score_cache import text_hash
+
+MANIFEST_FILE = "manifest.json"
+SHARD_FORMATS = {"jsonl": ".jsonl", "arrow": ".arrow"}
+SPLITS = ["train", "val"]
+DEFAULT_SHARD_BYTES = 64 * 1024 * 1024
+SPLIT_BUCKETS = 10_000
+READ_CHUNK_CHARS = 1 << 20
+
+
+def iter_json_array(path) -> Iterator[Dict]:
+    """
+    Yields the objects of a top-level JSON array one at a time, reading
+    the file in chunks instead of parsing it whole.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+        started = False
+        while True:
+            # Skip separators between values
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if not started and pos < len(buf):
+                if buf[pos] != "[":
+                    raise ValueError(f"{path} is not a JSON array")
+                started, pos = True, pos + 1
+                continue
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(READ_CHUNK_CHARS)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield obj
+            pos = end
+
+
+def iter_records(path) -> Iterator[Dict]:
+    """
+    Streams records from a JSON Lines file or a JSON array file.
+    """
+    if Path(path).suffix == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        yield from iter_json_array(path)
+
+
+def split_of(key: str, val_fraction: float) -> str:
+    """
+    Split for a record, decided by the hash of its text alone: the same
+    text always lands in the same split, whatever else is in the corpus.
+    """
+    bucket = int(key[:8], 16) % SPLIT_BUCKETS
+    return "val" if bucket < val_fraction * SPLIT_BUCKETS else "train"
+
+
+class ShardWriter:
+    """
+    Writes records of one split to numbered shards of at most about
+    ``max_bytes`` (counted as serialized JSON).
+    """
+
+    def __init__(self, root, split: str, fmt: str = "jsonl", max_bytes: int = DEFAULT_SHARD_BYTES):
+        if fmt not in SHARD_FORMATS:
+            raise ValueError(f"Unknown shard format '{fmt}', expected one of {list(SHARD_FORMATS)}")
+        self.root = Path(root)
+        self.split = split
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.shards: List[Dict] = []
+        self._records: List[Dict] = []
+        self._file = None
+        self._bytes = 0
+        self._count = 0
+
+    def _shard_name(self) -> str:
+        return f"{self.split}-{len(self.shards):05d}{SHARD_FORMATS[self.fmt]}"
+
+    def write(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False)
+        if self._count and self._bytes + len(line) > self.max_bytes:
+            self._finish_shard()
+        if self.fmt == "jsonl":
+            if self._file is None:
+                self._file = open(self.root / self._shard_name(), "w", encoding="utf-8")
+            self._file.write(line + "\n")
+        else:
+            # Arrow shards are written whole; only one shard is held at a time
+            self._records.append(record)
+        self._bytes += len(line) + 1
+        self._count += 1
+
+    def _finish_shard(self):
+        if not self._count:
+            return
+        name = self._shard_name()
+        if self.fmt == "jsonl":
+            self._file.close()
+            self._file = None
+        else:
+            write_records(self.root / name, self._records)
+            self._records = []
+        self.shards.append({"file": name, "records": self._count, "bytes": self._bytes})
+        self._bytes = self._count = 0
+
+    def close(self) -> Dict:
+        self._finish_shard()
+        return {"records": sum(s["records"] for s in self.shards), "shards": self.shards}
+
+
+def write_shards(
+    records: Iterable[Dict], root, fmt: str = "jsonl", val_fraction: float = 0.05,
+    max_bytes: int = DEFAULT_SHARD_BYTES, exclude: Optional[set] = None
+) -> Dict:
+    """
+    Streams ``records`` into train/val shards under ``root`` and writes the
+    manifest, which is also returned.
+
+    Records whose text (after whitespace / unicode normalization) was seen
+    before are dropped, as are records whose ``uid`` is in ``exclude``.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    writers = {split: ShardWriter(root, split, fmt, max_bytes) for split in SPLITS}
+    seen = set()
+    sources: Dict[str, int] = {}
+    duplicates = excluded = 0
+
+    for record in records:
+        if exclude and record["uid"] in exclude:
+            excluded += 1
+            continue
+        key = text_hash(record["text"])
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        sources[record["source"]] = sources.get(record["source"], 0) + 1
+        writers[split_of(key, val_fraction)].write(record)
+
+    manifest = {
+        "format": fmt,
+        "val_fraction": val_fraction,
+        "sources": sources,
+        "duplicates_dropped": duplicates,
+        "excluded": excluded,
+        "splits": {split: writer.close() for split, writer in writers.items()},
+    }
+    with open(root / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(root) -> Dict:
+    with open(Path(root) / MANIFEST_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_split(root, split: str) -> Iterator[Dict]:
+    """
+    Streams the records of one split, shard by shard.
+    """
+    root = Path(root)
+    for shard in load_manifest(root)["splits"][split]["shards"]:
+        path = root / shard["file"]
+        if path.suffix == ".jsonl":
+            yield from iter_records(path)
+        else:
+            yield from read_records(path)
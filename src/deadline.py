@@ -0,0 +1,112 @@
+# src/deadline.py
+
+import math
+import time
+from typing import Dict, List
+
+from src.decoding_profiles import DECODING_PROFILES
+
+# Rough CPU cost model for planning a latency budget: per-chunk numbers are
+# stage-1 generate time for one 300-token chunk, per-document numbers cover
+# the final merge pass. Recalibrate on new hardware with scripts/bench_t5_int8.py.
+MODEL_LOAD_SECONDS = 25.0
+SECONDS_PER_CHUNK = {"fast": 1.5, "balanced": 3.0, "quality": 6.0}
+SECONDS_PER_DOCUMENT = {"fast": 3.0, "balanced": 6.0, "quality": 12.0}
+# LegalBERT runs before generation and scores every sentence of the
+# cleaned text; recalibrate with scripts/bench_legalbert_batching.py
+LEGALBERT_LOAD_SECONDS = 8.0
+LEGALBERT_SECONDS_PER_SENTENCE = 0.02
+WORDS_PER_SENTENCE = 30
+
+CHUNK_TOKENS = 300              # keep in sync with backend/scripts/t5_abstractive.py
+TOKENS_PER_WORD = 1.3           # T5 sentencepiece tokens per word of legal English
+EXTRACT_RATIO = 0.6             # default LegalBERT --ratio
+
+
+class Deadline:
+    """
+    Wall-clock deadline shared across pipeline stages and processes.
+
+    ``missed`` becomes True once the deadline is found to have passed, and
+    stays True, so callers can report degraded output afterwards.
+    """
+
+    def __init__(self, at: float):
+        self.at = at
+        self.missed = False
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.time() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.time())
+
+    def expired(self) -> bool:
+        if time.time() >= self.at:
+            self.missed = True
+        return self.missed
+
+
+def legalbert_seconds(doc_words: List[int], workers: int = 1) -> float:
+    """
+    Estimated LegalBERT stage time: model load plus scoring every sentence,
+    split across ``workers`` processes.
+    """
+    sentences = sum(doc_words) / WORDS_PER_SENTENCE
+    return LEGALBERT_LOAD_SECONDS + sentences * LEGALBERT_SECONDS_PER_SENTENCE / max(1, workers)
+
+
+def plan_for_budget(seconds: float, doc_words: List[int], profile: str, workers: int = 1) -> Dict:
+    """
+    Picks the decoding profile and LegalBERT token budget that fit the
+    remaining latency budget, measured from just before the LegalBERT stage.
+
+    The LegalBERT stage time is taken off the budget first. Profiles are
+    then tried from the requested one down to the cheapest. If even the
+    cheapest cannot cover the full extract, the number of stage-1 chunks
+    per document is capped by what the budget affords. ``degraded`` is True
+    when the plan had to drop below the requested profile or the default
+    extraction size.
+
+    ``chunks_per_document`` is only enforced through ``token_budget``:
+    LegalBERT keeps that many chunks' worth of T5 tokens (``--token-budget``)
+    and T5 chunks whatever it receives. With ``workers`` dataset-mode
+    processes, documents are assumed to split evenly between them.
+
+    Limits: the per-chunk costs are measured per chunk with stage-1 batching
+    on, so they do not model batch-size effects; workers sharing a slot's
+    cores are assumed not to slow each other down; cleaning is not counted.
+    The T5 ``--deadline`` is what actually bounds the run when the estimate
+    is off.
+    """
+    order = sorted(DECODING_PROFILES, key=lambda p: SECONDS_PER_CHUNK[p])
+    candidates = order[:order.index(profile) + 1][::-1]
+
+    # Documents each worker handles in turn
+    n_docs = math.ceil(max(1, len(doc_words)) / max(1, workers))
+    needed = max(
+        math.ceil(w * TOKENS_PER_WORD * EXTRACT_RATIO / CHUNK_TOKENS) for w in doc_words or [0]
+    )
+    needed = max(1, needed)
+    generation_seconds = seconds - legalbert_seconds(doc_words, workers)
+
+    def affordable(name: str) -> int:
+        spare = generation_seconds - MODEL_LOAD_SECONDS - n_docs * SECONDS_PER_DOCUMENT[name]
+        return int(spare // (n_docs * SECONDS_PER_CHUNK[name]))
+
+    # Keep the whole extract at the best profile that affords it; otherwise
+    # fall back to the cheapest profile and shrink the extract instead
+    for name in candidates:
+        chunks = affordable(name)
+        if chunks >= needed:
+            break
+    # Nothing fits at all: run one chunk and let generation be cut short
+    chunks = max(1, min(chunks, needed))
+
+    return {
+        "profile": name,
+        "chunks_per_document": chunks,
+        "token_budget": chunks * CHUNK_TOKENS if chunks < needed else None,
+        "degraded": name != profile or chunks < needed,
+    }
@@ -0,0 +1,53 @@
+# src/decoding_profiles.py
+
+from typing import Dict
+
+DEFAULT_PROFILE = "balanced"
+
+# Named speed/quality tiers for the hierarchical T5 stage.
+# "balanced" matches the settings the backend has always used.
+DECODING_PROFILES = {
+    "fast": {
+        "num_beams": 2,
+        "no_repeat_ngram_size": 3,
+        "length_penalty": 1.0,
+        "stage1_max": 80,
+        "stage1_min": 30,
+        "final_max": 200,
+        "final_min": 80,
+    },
+    "balanced": {
+        "num_beams": 4,
+        "no_repeat_ngram_size": 3,
+        "length_penalty": 1.0,
+        "stage1_max": 120,
+        "stage1_min": 60,
+        "final_max": 350,
+        "final_min": 150,
+    },
+    "quality": {
+        "num_beams": 8,
+        "no_repeat_ngram_size": 3,
+        "length_penalty": 1.0,
+        "stage1_max": 120,
+        "stage1_min": 60,
+        "final_max": 360,
+        "final_min": 150,
+    },
+}
+
+
+def generation_kwargs(profile: str, stage: str) -> Dict:
+    """
+    Builds ``model.generate`` arguments for a profile and a stage
+    ("stage1" for chunk summaries, "final" for the merge pass).
+    """
+    p = DECODING_PROFILES[profile]
+    return dict(
+        max_length=p[f"{stage}_max"],
+        min_length=p[f"{stage}_min"],
+        num_beams=p["num_beams"],
+        no_repeat_ngram_size=p["no_repeat_ngram_size"],
+        length_penalty=p["length_penalty"],
+        early_stopping=p["num_beams"] > 1
+    )
@@ -0,0 +1,152 @@
+# src/intermediate_store.py
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Record lists handed between pipeline stages. The file format follows the
+# extension, so stage scripts only need --input/--output paths.
+FORMAT_SUFFIXES = {
+    "msgpack": ".msgpack",
+    "arrow": ".arrow",
+    "json": ".json",
+}
+PREFERRED_FORMATS = ["arrow", "msgpack", "json"]
+
+
+def _module_for(fmt: str):
+    if fmt == "msgpack":
+        import msgpack
+        return msgpack
+    if fmt == "arrow":
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        return pyarrow
+    return json
+
+
+def available_formats() -> List[str]:
+    """
+    Formats whose optional dependency is installed, in order of preference
+    (pyarrow already ships with ``datasets``, msgpack is optional).
+    """
+    found = []
+    for fmt in PREFERRED_FORMATS:
+        try:
+            _module_for(fmt)
+        except ImportError:
+            continue
+        found.append(fmt)
+    return found
+
+
+def format_of(path) -> str:
+    suffix = Path(path).suffix
+    for fmt, ext in FORMAT_SUFFIXES.items():
+        if ext == suffix:
+            return fmt
+    raise ValueError(f"Unknown intermediate format for {path}, expected one of {list(FORMAT_SUFFIXES.values())}")
+
+
+def write_records(path, records: List[Dict]):
+    """
+    Writes a list of records in the format given by the file extension.
+    JSON stays indented so it remains the human-readable export.
+    """
+    fmt = format_of(path)
+    if fmt == "msgpack":
+        msgpack = _module_for(fmt)
+        with open(path, "wb") as f:
+            f.write(msgpack.packb(records, use_bin_type=True))
+    elif fmt == "arrow":
+        pa = _module_for(fmt)
+        table = pa.Table.from_pylist(records)
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+
+
+def read_records(path) -> List[Dict]:
+    fmt = format_of(path)
+    if fmt == "msgpack":
+        msgpack = _module_for(fmt)
+        with open(path, "rb") as f:
+            return msgpack.unpackb(f.read(), raw=False)
+    if fmt == "arrow":
+        pa = _module_for(fmt)
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        # Arrow fills fields missing from a record with nulls; drop them again
+        return [{k: v for k, v in row.items() if v is not None} for row in table.to_pylist()]
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FileStore:
+    """
+    Stage outputs stored as ``<name><suffix>`` files in a session directory.
+    """
+
+    def __init__(self, root, fmt: str):
+        if fmt not in FORMAT_SUFFIXES:
+            raise ValueError(f"Unknown intermediate format '{fmt}', expected one of {list(FORMAT_SUFFIXES)}")
+        self.root = Path(root)
+        self.fmt = fmt
+
+    def name(self, stage: str) -> str:
+        """
+        File name of a stage's output, relative to the session directory.
+        """
+        return stage + FORMAT_SUFFIXES[self.fmt]
+
+    def save(self, stage: str, records: List[Dict]):
+        write_records(self.root / self.name(stage), records)
+
+    def load(self, stage: str) -> List[Dict]:
+        return read_records(self.root / self.name(stage))
+
+    def export_json(self, stage: str) -> Path:
+        """
+        Writes a readable JSON copy of a stage's output next to it.
+        """
+        path = self.root / (stage + ".json")
+        if self.fmt != "json":
+            write_records(path, self.load(stage))
+        return path
+
+
+class MemoryStore:
+    """
+    In-process handoff: stages running in the same process pass the record
+    lists directly and nothing is serialized unless exported.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root is not None else None
+        self.records: Dict[str, List[Dict]] = {}
+
+    def save(self, stage: str, records: List[Dict]):
+        self.records[stage] = records
+
+    def load(self, stage: str) -> List[Dict]:
+        return self.records[stage]
+
+    def export_json(self, stage: str) -> Path:
+        if self.root is None:
+            raise ValueError("MemoryStore needs a root directory to export JSON")
+        path = self.root / (stage + ".json")
+        write_records(path, self.records[stage])
+        return path
+
+
+def open_store(root, fmt: Optional[str] = None):
+    """
+    Store for a session directory; ``fmt`` defaults to the fastest format
+    available, and "memory" gives an in-process store.
+    """
+    fmt = fmt or available_formats()[0]
+    if fmt == "memory":
+        return MemoryStore(root)
+    return FileStore(root, fmt)
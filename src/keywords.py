@@ -0,0 +1,103 @@
+# src/keywords.py
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterator, List, Set, Tuple
+
+# Legal cue phrases shared by the lexical pre-filter (src/lexical_scorer.py)
+# and the keyword heuristic in scripts/t5.py; lowercase, as both match on
+# lowercased text
+KEYWORDS = [
+    "held that", "it is held", "it is observed", "accordingly",
+    "appeal is dismissed", "appeal is allowed", "petition is dismissed",
+    "section", "sections", "fir", "settlement", "arbitration",
+    "inherent power", "supreme court", "high court", "tribunal",
+    "judgment", "order"
+]
+
+# Same boundary as split_into_sentences; the separator is captured so span
+# offsets can be accumulated from the split pieces without a Python loop
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])(\s+)')
+
+
+def _sentence_bounds(text: str) -> Tuple[List[int], List[int]]:
+    parts = SENTENCE_SPLIT.split(text)
+    offsets = [0] + list(accumulate(map(len, parts)))
+    return offsets[0::2][:len(parts[0::2])], offsets[1::2]
+
+
+class KeywordIndex:
+    """
+    Keyword lookup over a whole document instead of per sentence.
+
+    The document is lowercased and its sentence boundaries computed once.
+    Each keyword is then located with ``str.find`` over the full text and
+    mapped to its sentence by binary search, jumping to the end of that
+    sentence after a hit. Sentence strings are only built for hits, and
+    duplicates are filtered with a set.
+    """
+
+    def __init__(self, keywords: List[str]):
+        # Keyword order is the priority order; matching is case-insensitive
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords))
+
+    def _prepare(self, text: str):
+        lowered = text.lower()
+        starts, ends = _sentence_bounds(lowered)
+        # lower() never adds or removes the punctuation and whitespace that
+        # delimit sentences, so bounds line up by index even if lengths differ
+        orig = (starts, ends) if len(lowered) == len(text) else _sentence_bounds(text)
+
+        def sentence(i: int) -> str:
+            return text[orig[0][i]:orig[1][i]].strip()
+
+        return lowered, starts, ends, sentence
+
+    @staticmethod
+    def _hits(kw: str, lowered: str, starts, ends) -> Iterator[int]:
+        """
+        Yields, in document order, the index of each sentence containing ``kw``.
+        """
+        pos = lowered.find(kw)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            if pos + len(kw) <= ends[i]:
+                yield i
+                pos = lowered.find(kw, ends[i])
+            else:
+                pos = lowered.find(kw, pos + 1)
+
+    def keyword_sentences(self, text: str, limit: int) -> List[str]:
+        """
+        Sentences containing a keyword, ordered by keyword priority then
+        document position, without duplicates.
+        """
+        lowered, starts, ends, sentence = self._prepare(text)
+        found, seen = [], set()
+        for kw in self.keywords:
+            for i in self._hits(kw, lowered, starts, ends):
+                sent = sentence(i)
+                if sent and sent not in seen:
+                    seen.add(sent)
+                    found.append(sent)
+                    if len(found) >= limit:
+                        return found
+        return found
+
+    def matching_sentences(self, text: str) -> List[str]:
+        """
+        Sentences containing any keyword, in document order.
+        """
+        lowered, starts, ends, sentence = self._prepare(text)
+        matched: Set[int] = set()
+        for kw in self.keywords:
+            matched.update(self._hits(kw, lowered, starts, ends))
+        return [s for s in (sentence(i) for i in sorted(matched)) if s]
+
+    def count_keywords(self, text: str) -> int:
+        """
+        Number of distinct keywords present in ``text``.
+        """
+        lowered = text.lower()
+        return sum(1 for kw in self.keywords if kw in lowered)
@@ -0,0 +1,271 @@
+# src/legalbert_scorer.py
+
+import re
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+
+from src.score_cache import PersistentLRUCache, text_hash
+from src.shared_weights import load_shared_weights
+from src.worker_pool import ModelWorkerPool
+
+MAX_SENT_TOKENS = 128
+DEFAULT_BATCH_SIZE = 64
+DOCUMENTS_PER_TASK = 8  # documents a pooled worker scores together
+
+# Exported graphs live next to the PyTorch checkpoint (see scripts/export_legalbert_onnx.py)
+ONNX_SUBDIR = "onnx"
+ONNX_MODEL_FILES = {
+    "onnx": "model.onnx",
+    "onnx-int8": "model.int8.onnx",
+}
+BACKENDS = ["torch"] + list(ONNX_MODEL_FILES)
+
+
+def split_into_sentences(text: str) -> List[str]:
+    """
+    Splits text into sentences, dropping fragments of 20 characters or less.
+    """
+    return [s.strip() for s in re.split(r'(?<=[.!?])\s+', text) if len(s.strip()) > 20]
+
+
+def length_sorted_batches(lengths: List[int], batch_size: int) -> List[List[int]]:
+    """
+    Groups item indices into batches of similar length so padding stays small.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def group_by_document(flat_scores: List[float], documents: List[List[str]]) -> List[List[float]]:
+    grouped, start = [], 0
+    for sents in documents:
+        grouped.append(flat_scores[start:start + len(sents)])
+        start += len(sents)
+    return grouped
+
+
+class LegalBertScorer:
+    """
+    Scores sentences with the fine-tuned LegalBERT classifier.
+
+    Sentences from all documents are pooled into shared, length-sorted
+    batches, so a run made of many short documents still gets full batches.
+    """
+
+    def __init__(self, tokenizer, model, device, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.device = device
+        self.batch_size = batch_size
+
+    def _forward(self, batch) -> List[float]:
+        batch = {k: v.to(self.device) for k, v in batch.items()}
+        with torch.no_grad():
+            probs = torch.softmax(self.model(**batch).logits, dim=1)[:, 1]
+        return probs.float().cpu().tolist()
+
+    def score_sentences(self, sents: List[str]) -> List[float]:
+        if not sents:
+            return []
+
+        enc = self.tokenizer(sents, truncation=True, max_length=MAX_SENT_TOKENS)
+        lengths = [len(ids) for ids in enc["input_ids"]]
+
+        scores = [0.0] * len(sents)
+        for idx in length_sorted_batches(lengths, self.batch_size):
+            features = [{k: enc[k][i] for k in enc.keys()} for i in idx]
+            batch = self.tokenizer.pad(features, return_tensors="pt")
+            for i, p in zip(idx, self._forward(batch)):
+                scores[i] = p
+        return scores
+
+    def score_documents(self, documents: List[List[str]]) -> List[List[float]]:
+        """
+        Scores the sentences of many documents in one pooled pass and
+        regroups the probabilities per document.
+        """
+        flat = [s for sents in documents for s in sents]
+        return group_by_document(self.score_sentences(flat), documents)
+
+
+class OnnxLegalBertScorer(LegalBertScorer):
+    """
+    Runs the exported LegalBERT graph with ONNX Runtime on CPU.
+    """
+
+    def __init__(self, tokenizer, onnx_path, batch_size: int = DEFAULT_BATCH_SIZE):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "onnxruntime is required for the ONNX LegalBERT backend "
+                "(pip install onnxruntime)"
+            ) from e
+
+        session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+        super().__init__(tokenizer, session, "cpu", batch_size)
+        self.input_names = [i.name for i in session.get_inputs()]
+
+    def _forward(self, batch) -> List[float]:
+        feeds = {k: batch[k].numpy().astype(np.int64) for k in self.input_names}
+        logits = self.model.run(None, feeds)[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs = probs[:, 1] / probs.sum(axis=1)
+        return probs.tolist()
+
+
+class CachedScorer:
+    """
+    Serves LegalBERT probabilities from a score cache and sends only misses
+    through the wrapped scorer.
+    """
+
+    def __init__(self, scorer: LegalBertScorer, cache: PersistentLRUCache, fingerprint: str):
+        self.scorer = scorer
+        self.cache = cache
+        self.fingerprint = fingerprint
+
+    def _key(self, sent: str) -> str:
+        return f"{self.fingerprint}:{text_hash(sent)}"
+
+    def score_sentences(self, sents: List[str]) -> List[float]:
+        keys = [self._key(s) for s in sents]
+        found = self.cache.get_many(keys)
+
+        # Boilerplate also repeats within a run, so each missing key is scored once
+        missing = {}
+        for key, sent in zip(keys, sents):
+            if key not in found and key not in missing:
+                missing[key] = sent
+
+        if missing:
+            fresh = dict(zip(missing, self.scorer.score_sentences(list(missing.values()))))
+            self.cache.put_many(fresh)
+            found.update(fresh)
+
+        return [found[k] for k in keys]
+
+    def score_documents(self, documents: List[List[str]]) -> List[Optional[List[float]]]:
+        """
+        Scores documents, generating only sentences missing from the cache.
+
+        Misses are handed to the wrapped scorer grouped by document, so a
+        pooled scorer can fail one document without losing the others; a
+        document is returned as ``None`` if any of its sentences is left
+        unscored.
+        """
+        keys = [[self._key(s) for s in sents] for sents in documents]
+        found = self.cache.get_many([k for ks in keys for k in ks])
+
+        missing, seen = [], set(found)
+        for sents, ks in zip(documents, keys):
+            miss = {}
+            for key, sent in zip(ks, sents):
+                if key not in seen:
+                    seen.add(key)
+                    miss[key] = sent
+            if miss:
+                missing.append(miss)
+
+        if missing:
+            scored = self.scorer.score_documents([list(m.values()) for m in missing])
+            fresh = {}
+            for miss, probs in zip(missing, scored):
+                if probs is not None:
+                    fresh.update(zip(miss, probs))
+            self.cache.put_many(fresh)
+            found.update(fresh)
+
+        return [
+            [found[k] for k in ks] if all(k in found for k in ks) else None
+            for ks in keys
+        ]
+
+
+def load_scorer(
+    model_path, backend: str = "torch", batch_size: int = DEFAULT_BATCH_SIZE, mmap_weights: bool = False
+) -> LegalBertScorer:
+    """
+    Builds a scorer for the requested inference backend.
+
+    With ``mmap_weights`` the torch backend on CPU memory-maps
+    ``model.safetensors`` so pooled workers share one copy of the weights.
+    """
+    model_path = Path(model_path)
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+
+    if backend == "torch":
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        model = None
+        if mmap_weights and device == "cpu":
+            config = AutoConfig.from_pretrained(model_path)
+            model = load_shared_weights(AutoModelForSequenceClassification.from_config(config), model_path)
+        if model is None:
+            model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        model = model.to(device)
+        model.eval()
+        return LegalBertScorer(tokenizer, model, device, batch_size=batch_size)
+
+    if backend in ONNX_MODEL_FILES:
+        onnx_path = model_path / ONNX_SUBDIR / ONNX_MODEL_FILES[backend]
+        if not onnx_path.exists():
+            raise FileNotFoundError(
+                f"{onnx_path} not found, run scripts/export_legalbert_onnx.py first"
+            )
+        return OnnxLegalBertScorer(tokenizer, onnx_path, batch_size=batch_size)
+
+    raise ValueError(f"Unknown LegalBERT backend: {backend}")
+
+
+def _score_documents(scorer: LegalBertScorer, documents: List[List[str]]) -> List[List[float]]:
+    return scorer.score_documents(documents)
+
+
+class PooledScorer:
+    """
+    Spreads LegalBERT scoring over processes that each hold a model copy.
+
+    Documents are handed to idle workers a few at a time and scored together
+    there, so throughput scales with the number of workers until the cores
+    run out. A document whose worker keeps failing comes back as ``None``
+    instead of failing the whole run.
+    """
+
+    def __init__(
+        self,
+        model_path,
+        backend: str = "torch",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: int = 2,
+        pin: bool = False,
+        timeout: Optional[float] = None,
+        mmap_weights: bool = False,
+    ):
+        self.pool = ModelWorkerPool(
+            load_scorer, _score_documents, workers,
+            init_args=(str(model_path), backend, batch_size, mmap_weights), pin=pin,
+            items_per_task=DOCUMENTS_PER_TASK, timeout=timeout
+        )
+
+    def score_sentences(self, sents: List[str]) -> List[float]:
+        scores = self.score_documents([sents])[0]
+        if scores is None:
+            raise RuntimeError(f"LegalBERT workers failed: {self.pool.failures[0]}")
+        return scores
+
+    def score_documents(self, documents: List[List[str]]) -> List[Optional[List[float]]]:
+        return self.pool.map(documents)
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
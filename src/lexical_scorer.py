@@ -0,0 +1,57 @@
+# src/lexical_scorer.py
+
+import re
+from typing import List, Optional
+
+import numpy as np
+
+from src.keywords import KEYWORDS
+
+KEYWORD_WEIGHT = 3
+SECTION_WEIGHT = 2
+LENGTH_WEIGHT = 1
+LONG_SENTENCE_WORDS = 20
+
+SECTION_RE = re.compile(r"\b(section|sec\.?)\s+\d+")
+
+
+def lexical_scores(sents: List[str]) -> np.ndarray:
+    """
+    Scores sentences with keyword, section-citation and length features.
+
+    Keyword presence is computed with one vectorized substring search per
+    keyword over the whole sentence array.
+    """
+    if not sents:
+        return np.zeros(0, dtype=np.int32)
+
+    lowered = np.array([s.lower() for s in sents])
+
+    keyword_hits = np.zeros(len(sents), dtype=np.int32)
+    for kw in KEYWORDS:
+        keyword_hits += np.char.find(lowered, kw) >= 0
+
+    has_section = np.fromiter(
+        (SECTION_RE.search(s) is not None for s in lowered), dtype=bool, count=len(sents)
+    )
+    word_counts = np.fromiter((len(s.split()) for s in sents), dtype=np.int32, count=len(sents))
+
+    return (
+        KEYWORD_WEIGHT * keyword_hits
+        + SECTION_WEIGHT * has_section
+        + LENGTH_WEIGHT * (word_counts > LONG_SENTENCE_WORDS)
+    )
+
+
+def prefilter_sentences(sents: List[str], threshold: Optional[int]) -> List[str]:
+    """
+    Drops sentences whose lexical score is below ``threshold``.
+
+    Document order is preserved. If nothing survives, all sentences are
+    returned so LegalBERT still has something to rank.
+    """
+    if threshold is None or not sents:
+        return sents
+    keep = lexical_scores(sents) >= threshold
+    survivors = [s for s, k in zip(sents, keep) if k]
+    return survivors or sents
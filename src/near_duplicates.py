@@ -0,0 +1,153 @@
+# src/near_duplicates.py
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16                  # 16 bands x 8 rows: pairs above ~0.7 Jaccard collide in some band
+SHINGLE_WORDS = 5
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_BLOCK = 4096        # shingles hashed against all permutations at once
+MERSENNE_61 = (1 << 61) - 1
+
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def _word_hashes(text: str) -> np.ndarray:
+    return np.fromiter(
+        (zlib.crc32(w.encode()) for w in WORD.findall(text.lower())), dtype=np.uint64
+    )
+
+
+def shingle_hashes(text: str, k: int = SHINGLE_WORDS) -> np.ndarray:
+    """
+    Distinct hashes of the word ``k``-grams of ``text`` (the whole text
+    when it has fewer than ``k`` words).
+    """
+    words = _word_hashes(text)
+    if len(words) == 0:
+        return words
+    k = min(k, len(words))
+    # Polynomial rolling combination of k word hashes, wrapping in 64 bits
+    h = np.zeros(len(words) - k + 1, dtype=np.uint64)
+    for i in range(k):
+        h = h * np.uint64(1_000_003) + words[i:len(words) - k + 1 + i]
+    return np.unique(h)
+
+
+class MinHasher:
+    """
+    MinHash signatures with ``num_perm`` universal hash functions
+    ``(a * x + b) mod p``; the same seed gives the same functions in every
+    process.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_61, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_61, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = shingle_hashes(text) % np.uint64(MERSENNE_61)
+        sig = np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        for start in range(0, len(shingles), SHINGLE_BLOCK):
+            block = shingles[start:start + SHINGLE_BLOCK, None]
+            # Products wrap in 64 bits; good enough mixing for MinHash
+            hashed = ((block * self.a + self.b) % np.uint64(MERSENNE_61)) >> np.uint64(29)
+            np.minimum(sig, hashed.min(axis=0).astype(np.uint32), out=sig)
+        return sig
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        return np.stack([self.signature(t) for t in texts]) if texts else np.zeros((0, self.num_perm), np.uint32)
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int = BANDS) -> set:
+    """
+    Pairs of rows sharing all values of at least one band. Each band is a
+    hash table lookup per document, and a bucket's members are only paired
+    with its first member, so the search stays linear in the number of
+    documents even when many copies of one judgment collide.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        chunk = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for i in range(n):
+            buckets[chunk[i].tobytes()].append(i)
+        for first, *rest in buckets.values():
+            pairs.update((first, other) for other in rest)
+    return pairs
+
+
+def estimated_jaccard(signatures: np.ndarray, i: int, j: int) -> float:
+    return float(np.mean(signatures[i] == signatures[j]))
+
+
+def duplicate_clusters(
+    signatures: np.ndarray, threshold: float = DEFAULT_THRESHOLD, bands: int = BANDS
+) -> List[Tuple[List[int], float]]:
+    """
+    Groups rows whose estimated Jaccard similarity reaches ``threshold``
+    (transitively) and returns ``(members, mean pair similarity)`` per
+    cluster of two or more, largest first.
+    """
+    parent = list(range(len(signatures)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    similar = []
+    for i, j in candidate_pairs(signatures, bands):
+        sim = estimated_jaccard(signatures, i, j)
+        if sim >= threshold:
+            similar.append((i, j, sim))
+            parent[find(i)] = find(j)
+
+    members: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(signatures)):
+        members[find(i)].append(i)
+    sims: Dict[int, List[float]] = defaultdict(list)
+    for i, _, sim in similar:
+        sims[find(i)].append(sim)
+
+    clusters = [(m, sum(sims[root]) / len(sims[root])) for root, m in members.items() if len(m) > 1]
+    return sorted(clusters, key=lambda c: (-len(c[0]), c[0][0]))
+
+
+def excluded_uids(report: Dict, policy: str = "keep-one") -> set:
+    """
+    uids to leave out of the splits for the clusters in a near-duplicate
+    report: every member but the first (``keep-one``) or every member
+    (``drop-all``).
+    """
+    if policy not in ("keep-one", "drop-all"):
+        raise ValueError(f"Unknown near-duplicate policy '{policy}', expected 'keep-one' or 'drop-all'")
+    skip = 1 if policy == "keep-one" else 0
+    return {m["uid"] for cluster in report["clusters"] for m in cluster["members"][skip:]}
+
+
+def cluster_report(uids: Sequence[str], sources: Sequence[str], clusters: Iterable) -> Dict:
+    clusters = [
+        {
+            "size": len(members),
+            "similarity": round(sim, 3),
+            "members": [{"uid": uids[i], "source": sources[i]} for i in members],
+        }
+        for members, sim in clusters
+    ]
+    return {
+        "documents": len(uids),
+        "clusters": clusters,
+        "documents_in_clusters": sum(c["size"] for c in clusters),
+        "cross_source_clusters": sum(len({m["source"] for m in c["members"]}) > 1 for c in clusters),
+    }
@@ -0,0 +1,159 @@
+# src/pipeline_executor.py
+
+import json
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+DEFAULT_QUEUE_SIZE = 8
+POLL_SECONDS = 0.1
+
+_DONE = object()
+
+# Stage scripts print finished records on stdout with this prefix so the
+# backend can act on each one (e.g. score it) before the stage has ended
+RESULT_PREFIX = "RESULT "
+
+
+def report_result(record: Dict):
+    print(RESULT_PREFIX + json.dumps(record), flush=True)
+
+
+def parse_result(line: str) -> Optional[Dict]:
+    """
+    The record printed by ``report_result``, or None for any other line.
+    """
+    if not line.startswith(RESULT_PREFIX):
+        return None
+    return json.loads(line[len(RESULT_PREFIX):])
+
+
+class Stage(NamedTuple):
+    """
+    One pipeline step. ``fn`` takes a list of items and returns a list of
+    the same length; ``None`` drops an item from the rest of the pipeline.
+    """
+    name: str
+    fn: Callable[[List], List]
+    batch_size: int = 1
+
+
+class StreamingPipeline:
+    """
+    Runs stages concurrently, one thread per stage, connected by bounded
+    queues.
+
+    Each document moves on as soon as a stage is done with it, so cleaning
+    of later documents overlaps with model inference on earlier ones and a
+    batch takes about as long as its slowest stage. A full queue blocks the
+    stage feeding it (backpressure), which keeps memory flat on large runs.
+    A stage takes whatever is waiting, up to its ``batch_size``, so model
+    stages still batch under load. Torch and tokenizers release the GIL
+    during inference, which is what makes threads sufficient here.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        on_progress: Optional[Callable[[str, int], None]] = None,
+    ):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_progress = on_progress
+        self.stage_seconds: Dict[str, float] = {}
+
+    def run(self, items: Iterable) -> List:
+        """
+        Pushes ``items`` through all stages and returns the surviving outputs
+        in input order. The first exception raised by a stage stops the
+        pipeline and is re-raised here.
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        self.stage_seconds = {stage.name: 0.0 for stage in self.stages}
+
+        def put(q: queue.Queue, entry) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(entry, timeout=POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: queue.Queue):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=POLL_SECONDS)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def feed():
+            try:
+                for entry in enumerate(items):
+                    if not put(queues[0], entry):
+                        return
+                put(queues[0], _DONE)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        def work(k: int, stage: Stage):
+            inbox, outbox = queues[k], queues[k + 1]
+            done = 0
+            try:
+                finished = False
+                while not finished:
+                    first = get(inbox)
+                    if first is _DONE:
+                        break
+                    batch = [first]
+                    while len(batch) < stage.batch_size:
+                        try:
+                            entry = inbox.get_nowait()
+                        except queue.Empty:
+                            break
+                        if entry is _DONE:
+                            finished = True
+                            break
+                        batch.append(entry)
+
+                    start = time.perf_counter()
+                    outputs = stage.fn([item for _, item in batch])
+                    self.stage_seconds[stage.name] += time.perf_counter() - start
+
+                    for (i, _), out in zip(batch, outputs):
+                        if out is not None and not put(outbox, (i, out)):
+                            return
+                    done += len(batch)
+                    if self.on_progress is not None:
+                        self.on_progress(stage.name, done)
+                put(outbox, _DONE)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        threads = [threading.Thread(target=feed, daemon=True)] + [
+            threading.Thread(target=work, args=(k, stage), daemon=True)
+            for k, stage in enumerate(self.stages)
+        ]
+        for t in threads:
+            t.start()
+
+        results = {}
+        while True:
+            entry = get(queues[-1])
+            if entry is _DONE:
+                break
+            i, out = entry
+            results[i] = out
+
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+        return [results[i] for i in sorted(results)]
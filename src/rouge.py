@@ -0,0 +1,247 @@
+# src/rouge.py
+
+import re
+from collections import Counter
+from functools import lru_cache
+from multiprocessing import get_context
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Same metrics, tokenization and stemming as rouge_score.RougeScorer(use_stemmer=True)
+ROUGE_METRICS = ["rouge1", "rouge2", "rougeL"]
+NGRAM_ORDERS = {"rouge1": 1, "rouge2": 2}
+STEM_MIN_LENGTH = 4
+PAIRS_PER_TASK = 64
+
+NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+class Score(NamedTuple):
+    precision: float
+    recall: float
+    fmeasure: float
+
+
+class Reference(NamedTuple):
+    """
+    A tokenized reference with everything scoring needs precomputed:
+    n-gram counts per ROUGE-N order and, for ROUGE-L, one bit mask per
+    distinct token marking where it occurs.
+    """
+    tokens: Tuple[str, ...]
+    ngrams: Dict[int, Counter]
+    lcs_masks: Dict[str, int]
+
+
+@lru_cache(maxsize=None)
+def _stemmer():
+    from nltk.stem import porter
+    return porter.PorterStemmer()
+
+
+@lru_cache(maxsize=200_000)
+def _stem(word: str) -> str:
+    # The vocabulary of a corpus is small, so every word is stemmed once
+    return _stemmer().stem(word)
+
+
+def tokenize(text: str, use_stemmer: bool = True) -> List[str]:
+    """
+    Lowercases, splits on anything that is not a letter or digit, and
+    Porter-stems words longer than three characters, like rouge_score.
+    """
+    tokens = NON_ALNUM.sub(" ", text.lower()).split()
+    if use_stemmer:
+        tokens = [_stem(t) if len(t) >= STEM_MIN_LENGTH else t for t in tokens]
+    return tokens
+
+
+def ngram_counts(tokens: Sequence[str], n: int) -> Counter:
+    return Counter(zip(*(tokens[i:] for i in range(n))))
+
+
+def lcs_masks(tokens: Sequence[str]) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    for i, token in enumerate(tokens):
+        masks[token] = masks.get(token, 0) | (1 << i)
+    return masks
+
+
+def lcs_length(masks: Dict[str, int], length: int, other: Sequence[str]) -> int:
+    """
+    Longest common subsequence of a reference (given by its ``lcs_masks``)
+    and ``other``, with the bit-parallel algorithm of Hyyrö (2004): one
+    row of the DP table is a single integer, so each token of ``other``
+    costs a few big-integer operations instead of a loop over the reference.
+    """
+    full = (1 << length) - 1
+    row = full
+    for token in other:
+        matches = row & masks.get(token, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return length - bin(row).count("1")
+
+
+def _fmeasure(overlap: int, pred_total: int, ref_total: int) -> Score:
+    precision = overlap / pred_total if pred_total else 0.0
+    recall = overlap / ref_total if ref_total else 0.0
+    if precision + recall == 0:
+        return Score(precision, recall, 0.0)
+    return Score(precision, recall, 2 * precision * recall / (precision + recall))
+
+
+class RougeEvaluator:
+    """
+    ROUGE-1/2/L F-measure with every reference tokenized and stemmed once.
+
+    Prepared references are kept by text, so scoring another system, a
+    bootstrap resample or a re-run against the same references only
+    tokenizes the predictions.
+    """
+
+    def __init__(self, metrics: Sequence[str] = ROUGE_METRICS, use_stemmer: bool = True):
+        unknown = set(metrics) - set(ROUGE_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown ROUGE metrics {sorted(unknown)}, expected some of {ROUGE_METRICS}")
+        self.metrics = list(metrics)
+        self.use_stemmer = use_stemmer
+        self.references: Dict[str, Reference] = {}
+
+    def reference(self, text: str) -> Reference:
+        ref = self.references.get(text)
+        if ref is None:
+            tokens = tuple(tokenize(text, self.use_stemmer))
+            ref = Reference(
+                tokens,
+                {n: ngram_counts(tokens, n) for m, n in NGRAM_ORDERS.items() if m in self.metrics},
+                lcs_masks(tokens) if "rougeL" in self.metrics else {},
+            )
+            self.references[text] = ref
+        return ref
+
+    def score(self, reference: str, prediction: str) -> Dict[str, Score]:
+        ref = self.reference(reference)
+        pred = tokenize(prediction, self.use_stemmer)
+
+        scores = {}
+        for metric in self.metrics:
+            if metric == "rougeL":
+                overlap = lcs_length(ref.lcs_masks, len(ref.tokens), pred)
+                scores[metric] = _fmeasure(overlap, len(pred), len(ref.tokens))
+                continue
+            n = NGRAM_ORDERS[metric]
+            ref_counts, pred_counts = ref.ngrams[n], ngram_counts(pred, n)
+            overlap = sum((ref_counts & pred_counts).values())
+            scores[metric] = _fmeasure(overlap, sum(pred_counts.values()), sum(ref_counts.values()))
+        return scores
+
+    def score_many(self, pairs: Iterable[Tuple[str, str]]) -> List[Dict[str, Score]]:
+        return [self.score(reference, prediction) for reference, prediction in pairs]
+
+
+def rouge1_fmeasures(reference: Reference, candidates: Sequence[Sequence[str]]) -> np.ndarray:
+    """
+    ROUGE-1 F-measure of many tokenized candidates (e.g. every sentence of
+    a document) against one reference prepared with rouge1 enabled.
+
+    Candidates are counted into one (candidate x reference vocabulary)
+    matrix, with a spare column for words the reference does not have, so
+    the clipped overlaps of all candidates come from a single minimum and
+    row sum.
+    """
+    ref_counts = reference.ngrams[1]
+    vocab = {unigram[0]: i for i, unigram in enumerate(ref_counts)}
+    width = len(vocab) + 1
+    ref_vec = np.array(list(ref_counts.values()) + [0], dtype=np.int64)
+
+    lengths = np.fromiter((len(c) for c in candidates), dtype=np.int64, count=len(candidates))
+    ids = np.fromiter(
+        (vocab.get(t, width - 1) for c in candidates for t in c), dtype=np.int64, count=int(lengths.sum())
+    )
+    rows = np.repeat(np.arange(len(candidates)), lengths)
+    counts = np.bincount(rows * width + ids, minlength=len(candidates) * width).reshape(-1, width)
+
+    overlap = np.minimum(counts, ref_vec).sum(axis=1)
+    precision = np.divide(overlap, lengths, out=np.zeros(len(candidates)), where=lengths > 0)
+    recall = overlap / ref_vec.sum() if ref_vec.sum() else np.zeros(len(candidates))
+    total = precision + recall
+    return np.divide(2 * precision * recall, total, out=np.zeros(len(candidates)), where=total > 0)
+
+
+# Per-process evaluator for pool workers; references stay cached across tasks
+_worker_evaluator: Optional[RougeEvaluator] = None
+
+
+def _init_worker(metrics, use_stemmer):
+    global _worker_evaluator
+    _worker_evaluator = RougeEvaluator(metrics, use_stemmer)
+
+
+def _score_chunk(pairs):
+    return _worker_evaluator.score_many(pairs)
+
+
+def evaluate(
+    pairs: Sequence[Tuple[str, str]],
+    metrics: Sequence[str] = ROUGE_METRICS,
+    use_stemmer: bool = True,
+    workers: int = 1,
+) -> List[Dict[str, Score]]:
+    """
+    Scores (reference, prediction) pairs, in order, across ``workers``
+    processes. Pairs are sent in chunks so each task amortizes the
+    round trip to its worker.
+    """
+    if workers <= 1 or len(pairs) <= PAIRS_PER_TASK:
+        return RougeEvaluator(metrics, use_stemmer).score_many(pairs)
+
+    chunks = [pairs[i:i + PAIRS_PER_TASK] for i in range(0, len(pairs), PAIRS_PER_TASK)]
+    with get_context("spawn").Pool(workers, _init_worker, (list(metrics), use_stemmer)) as pool:
+        return [s for chunk in pool.imap(_score_chunk, chunks) for s in chunk]
+
+
+def average_fmeasure(scores: Sequence[Dict[str, Score]]) -> Dict[str, float]:
+    """
+    Mean F-measure per metric, in percent.
+    """
+    if not scores:
+        return {}
+    return {m: sum(s[m].fmeasure for s in scores) / len(scores) * 100 for m in scores[0]}
+
+
+def per_sample_records(ids: Sequence, scores: Sequence[Dict[str, Score]]) -> List[Dict]:
+    """
+    Flat per-sample rows (``id``, ``rouge1_p``, ``rouge1_r``, ``rouge1_f``, ...)
+    for writing with ``src.intermediate_store.write_records``.
+    """
+    rows = []
+    for sample_id, score in zip(ids, scores):
+        row = {"id": sample_id}
+        for metric, s in score.items():
+            row[f"{metric}_p"], row[f"{metric}_r"], row[f"{metric}_f"] = s
+        rows.append(row)
+    return rows
+
+
+class RunningRouge:
+    """
+    Running mean F-measure over samples scored so far, for live reporting.
+    """
+
+    def __init__(self, metrics: Sequence[str] = ROUGE_METRICS):
+        self.metrics = list(metrics)
+        self.count = 0
+        self.totals = {m: 0.0 for m in self.metrics}
+
+    def add(self, scores: Dict[str, Score]):
+        self.count += 1
+        for m in self.metrics:
+            self.totals[m] += scores[m].fmeasure
+
+    def summary(self) -> Dict:
+        """
+        ``{"samples": n, "rouge1": ..., ...}`` with the means in percent.
+        """
+        means = {m: round(t / self.count * 100, 2) if self.count else 0.0 for m, t in self.totals.items()}
+        return {"samples": self.count, **means}
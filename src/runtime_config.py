@@ -0,0 +1,93 @@
+# src/runtime_config.py
+
+import os
+from typing import Dict, List, Optional
+
+# Environment variables a parent process uses to hand a thread allotment to a stage script
+THREADS_ENV = "INFERENCE_THREADS"
+INTEROP_THREADS_ENV = "INFERENCE_INTEROP_THREADS"
+AFFINITY_ENV = "INFERENCE_CPU_AFFINITY"
+
+
+def available_cpus() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def threads_per_slot(slots: int, cpus: Optional[int] = None) -> int:
+    """
+    Splits the cores evenly between concurrent execution slots.
+    """
+    cpus = cpus or len(available_cpus())
+    return max(1, cpus // max(1, slots))
+
+
+def slot_cpus(slot: int, slots: int) -> List[int]:
+    """
+    Returns the contiguous block of cores reserved for ``slot``.
+    """
+    cpus = available_cpus()
+    per_slot = threads_per_slot(slots, len(cpus))
+    start = (slot % max(1, slots)) * per_slot
+    return cpus[start:start + per_slot] or cpus
+
+
+def worker_env(slot: int, slots: int, pin: bool = False) -> Dict[str, str]:
+    """
+    Builds the environment for an inference worker running in ``slot``.
+
+    BLAS/OpenMP pools are sized to the slot's share of the cores and the
+    tokenizers' own thread pool is disabled, so concurrent workers do not
+    oversubscribe the machine.
+    """
+    threads = str(threads_per_slot(slots))
+    env = dict(os.environ)
+    env.update({
+        THREADS_ENV: threads,
+        INTEROP_THREADS_ENV: "1",
+        "OMP_NUM_THREADS": threads,
+        "MKL_NUM_THREADS": threads,
+        "OPENBLAS_NUM_THREADS": threads,
+        "TOKENIZERS_PARALLELISM": "false",
+    })
+    if pin:
+        env[AFFINITY_ENV] = ",".join(str(c) for c in slot_cpus(slot, slots))
+    return env
+
+
+def configure_runtime(
+    threads: Optional[int] = None,
+    interop_threads: Optional[int] = None,
+    affinity: Optional[List[int]] = None,
+):
+    """
+    Applies the thread allotment to this process.
+
+    Arguments default to the values passed down through ``worker_env``;
+    when nothing is set, torch keeps its own defaults.
+    """
+    threads = threads or int(os.environ.get(THREADS_ENV, 0))
+    interop_threads = interop_threads or int(os.environ.get(INTEROP_THREADS_ENV, 0))
+    if affinity is None and os.environ.get(AFFINITY_ENV):
+        affinity = [int(c) for c in os.environ[AFFINITY_ENV].split(",")]
+
+    if affinity and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, affinity)
+
+    if not (threads or interop_threads):
+        return
+    try:
+        import torch
+    except ImportError:
+        # Torch-free worker: the BLAS/OpenMP env from worker_env is all there is
+        return
+
+    if threads:
+        torch.set_num_threads(threads)
+    if interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            # Only settable before the first parallel region has run
+            pass
@@ -0,0 +1,151 @@
+# src/score_cache.py
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+def normalize_sentence(text: str) -> str:
+    """
+    Normalizes unicode and whitespace so trivially different copies share a key.
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(normalize_sentence(text).encode("utf-8")).hexdigest()
+
+
+def model_fingerprint(model_path, *extra, exclude: Iterable[str] = ()) -> str:
+    """
+    Fingerprints a model directory by file names, sizes and mtimes.
+
+    Any retrained or re-exported checkpoint changes the fingerprint, which
+    keeps stale cached values from being served. Top-level entries named
+    in ``exclude`` (files the caller never loads) are left out.
+    """
+    h = hashlib.sha1()
+    root = Path(model_path)
+    exclude = set(exclude)
+    for p in sorted(root.rglob("*")) if root.is_dir() else []:
+        if p.is_file() and p.relative_to(root).parts[0] not in exclude:
+            st = p.stat()
+            h.update(f"{p.relative_to(root)}:{st.st_size}:{int(st.st_mtime)}".encode())
+    for e in extra:
+        h.update(str(e).encode())
+    return h.hexdigest()[:16]
+
+
+class PersistentLRUCache:
+    """
+    In-memory LRU in front of an on-disk SQLite key/value store.
+
+    Lookups hit memory first, then disk. When ``max_disk_entries`` is set,
+    the least recently used rows are evicted from disk after each write.
+    Safe to share between the threads of a streaming pipeline.
+    """
+
+    def __init__(self, path, max_memory_entries: int = 100_000,
+                 max_disk_entries: Optional[int] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value, last_used REAL)"
+        )
+        # Eviction orders by last_used on every write; keep that off a full scan
+        self.conn.execute("CREATE INDEX IF NOT EXISTS cache_last_used ON cache(last_used)")
+        self.conn.commit()
+
+    def _remember(self, key: str, value):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, object]:
+        with self.lock:
+            return self._get_many(list(keys))
+
+    def _get_many(self, keys) -> Dict[str, object]:
+        found, on_disk = {}, []
+        for key in dict.fromkeys(keys):
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                found[key] = self.memory[key]
+            else:
+                on_disk.append(key)
+
+        # SQLite caps bound parameters per statement, so query in slices
+        for i in range(0, len(on_disk), 500):
+            part = on_disk[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT key, value FROM cache WHERE key IN ({','.join('?' * len(part))})",
+                part,
+            ).fetchall()
+            for key, value in rows:
+                found[key] = value
+                self._remember(key, value)
+
+        if found:
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE cache SET last_used = ? WHERE key = ?",
+                [(now, k) for k in found],
+            )
+            self.conn.commit()
+
+        misses = sum(1 for k in keys if k not in found)
+        self.hits += len(keys) - misses
+        self.misses += misses
+        return found
+
+    def put_many(self, items: Dict[str, object]):
+        if not items:
+            return
+        with self.lock:
+            self._put_many(items)
+
+    def _put_many(self, items: Dict[str, object]):
+        now = time.time()
+        for key, value in items.items():
+            self._remember(key, value)
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO cache (key, value, last_used) VALUES (?, ?, ?)",
+            [(k, v, now) for k, v in items.items()],
+        )
+        if self.max_disk_entries is not None:
+            self.conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            )
+        self.conn.commit()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> str:
+        return (f"{self.hits} hits / {self.hits + self.misses} lookups "
+                f"({self.hit_ratio * 100:.1f}% hit ratio)")
+
+    def close(self):
+        self.conn.close()
+
@@ -0,0 +1,41 @@
+# src/selection.py
+
+from typing import List, Sequence
+
+
+def select_by_ratio(sents: Sequence[str], probs: Sequence[float], ratio: float) -> List[str]:
+    """
+    Keeps the top ``ratio`` of sentences, ranked by probability (score order).
+    """
+    ranked = sorted(zip(sents, probs), key=lambda x: x[1], reverse=True)
+    keep = max(1, int(len(ranked) * ratio))
+    return [s for s, _ in ranked[:keep]]
+
+
+def select_by_token_budget(
+    sents: Sequence[str],
+    probs: Sequence[float],
+    token_counts: Sequence[int],
+    budget: int,
+) -> List[str]:
+    """
+    Picks the highest-scoring sentences that fit in ``budget`` tokens and
+    returns them in document order.
+
+    Sentences that would overflow the budget are skipped so shorter,
+    lower-ranked ones can still fill the remainder. The best sentence is
+    always kept, even if it alone exceeds the budget.
+    """
+    if not sents:
+        return []
+
+    order = sorted(range(len(sents)), key=lambda i: probs[i], reverse=True)
+    chosen, used = [order[0]], token_counts[order[0]]
+    for i in order[1:]:
+        if used >= budget:
+            break
+        if used + token_counts[i] <= budget:
+            chosen.append(i)
+            used += token_counts[i]
+
+    return [sents[i] for i in sorted(chosen)]
@@ -0,0 +1,81 @@
+# src/shared_weights.py
+
+import json
+import logging
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+SAFETENSORS_FILE = "model.safetensors"
+
+SAFETENSORS_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
+def mmap_safetensors(path) -> Dict[str, torch.Tensor]:
+    """
+    Opens a safetensors file as tensors that are views into a memory map.
+
+    The file is mapped copy-on-write, so every process that maps the same
+    checkpoint reads one copy of the weights from the page cache; a page is
+    only duplicated if a process writes to it.
+    """
+    with open(path, "rb") as f:
+        header_len = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_len))
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    buf = torch.frombuffer(mm, dtype=torch.uint8)
+    data_start = 8 + header_len
+
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = SAFETENSORS_DTYPES[info["dtype"]]
+        start, end = (data_start + o for o in info["data_offsets"])
+        raw = buf[start:end]
+        if start % torch.empty(0, dtype=dtype).element_size():
+            # Views need aligned storage; unaligned tensors get their own copy
+            raw = raw.clone()
+        tensors[name] = raw.view(dtype).reshape(info["shape"])
+    return tensors
+
+
+def load_shared_weights(model: torch.nn.Module, model_dir) -> Optional[torch.nn.Module]:
+    """
+    Swaps a CPU model's parameters for memory-mapped ones from
+    ``model_dir/model.safetensors``.
+
+    Returns None (and leaves the model alone) when there is no safetensors
+    checkpoint to map, so callers can keep their regular loading path.
+    """
+    path = Path(model_dir) / SAFETENSORS_FILE
+    if not path.exists():
+        logger.info(f"{path} not found; weights are not shared between workers")
+        return None
+
+    state = mmap_safetensors(path)
+    missing, unexpected = model.load_state_dict(state, strict=False, assign=True)
+    # Tied weights (embeddings / LM head) are stored once, so re-tie them
+    if hasattr(model, "tie_weights"):
+        model.tie_weights()
+    if unexpected:
+        logger.warning(f"Unexpected keys in {path}: {unexpected[:5]}")
+    logger.info(f"Memory-mapped {len(state)} tensors from {path} ({len(missing)} kept from init)")
+    return model
@@ -0,0 +1,192 @@
+# src/t5_generation.py
+
+import hashlib
+import json
+from typing import Callable, Dict, List, Optional
+
+from src.deadline import Deadline
+from src.score_cache import PersistentLRUCache, text_hash
+
+PREFIX = "summarize: "
+MAX_INPUT_TOKENS = 512
+
+# Upper bound on input tokens x beams per generate call; keeps beam-search
+# activations within a few hundred MB on CPU and a 4GB GPU
+DEFAULT_MAX_BATCH_TOKENS = 16384
+
+MAX_REDUCE_LEVELS = 8
+
+
+def budgeted_batches(lengths: List[int], max_batch_tokens: int, num_beams: int = 1) -> List[List[int]]:
+    """
+    Groups indices into length-sorted batches whose padded size
+    (batch size x longest input x beams) stays within ``max_batch_tokens``.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches, current = [], []
+    for i in order:
+        # Longest item comes first, so it sets the padded length of the batch
+        longest = lengths[current[0]] if current else lengths[i]
+        if current and (len(current) + 1) * longest * num_beams > max_batch_tokens:
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def summarize_batch(
+    texts: List[str],
+    tokenizer,
+    model,
+    device,
+    gen_kwargs: Dict,
+    max_input_tokens: int = MAX_INPUT_TOKENS,
+    max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+    deadline: Optional[Deadline] = None,
+) -> List[str]:
+    """
+    Summarizes many texts in padded, length-sorted batches and returns the
+    summaries in input order.
+
+    With a ``deadline`` each generate call is capped at the remaining time
+    and batches not started before it passes are left as empty strings.
+    """
+    if not texts:
+        return []
+
+    # Imported here so the reduce / memo helpers load without torch
+    import torch
+
+    enc = tokenizer(
+        [PREFIX + t for t in texts],
+        truncation=True,
+        max_length=max_input_tokens
+    )
+    lengths = [len(ids) for ids in enc["input_ids"]]
+
+    outputs = [""] * len(texts)
+    for idx in budgeted_batches(lengths, max_batch_tokens, gen_kwargs.get("num_beams", 1)):
+        kwargs = gen_kwargs
+        if deadline is not None:
+            if deadline.expired():
+                break
+            kwargs = dict(gen_kwargs, max_time=deadline.remaining())
+
+        batch = tokenizer.pad(
+            {k: [enc[k][i] for i in idx] for k in ("input_ids", "attention_mask")},
+            return_tensors="pt"
+        ).to(device)
+
+        with torch.no_grad():
+            out = model.generate(**batch, **kwargs)
+
+        for i, seq in zip(idx, out):
+            outputs[i] = tokenizer.decode(seq, skip_special_tokens=True)
+
+    if deadline is not None:
+        # A generate call stopped by max_time returns early at the deadline
+        deadline.expired()
+
+    return outputs
+
+
+def group_by_tokens(texts: List[str], tokenizer, max_tokens: int) -> List[str]:
+    """
+    Joins consecutive texts into groups of at most ``max_tokens`` tokens.
+    """
+    lengths = [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+    groups, current, used = [], [], 0
+    for text, n in zip(texts, lengths):
+        if current and used + n > max_tokens:
+            groups.append(" ".join(current))
+            current, used = [], 0
+        current.append(text)
+        used += n
+    if current:
+        groups.append(" ".join(current))
+    return groups
+
+
+def tree_reduce(
+    summaries: List[str],
+    tokenizer,
+    summarize_fn: Callable[[List[str], Dict], List[str]],
+    level_kwargs: Dict,
+    final_kwargs: Dict,
+    max_input_tokens: int = MAX_INPUT_TOKENS,
+) -> str:
+    """
+    Reduces many summaries to one without truncating any of them.
+
+    Summaries are packed into groups that fit one model input and each level
+    is summarized in a single batched call, until everything fits in the
+    final pass. Each level shrinks the input by the group fan-out, so the
+    number of levels grows with O(log n).
+    """
+    budget = max_input_tokens - len(tokenizer(PREFIX)["input_ids"])
+    level = summaries
+
+    for _ in range(MAX_REDUCE_LEVELS):
+        groups = group_by_tokens(level, tokenizer, budget)
+        if len(groups) == 1 or len(groups) >= len(level):
+            break
+        level = summarize_fn(groups, level_kwargs)
+
+    return summarize_fn([" ".join(level)], final_kwargs)[0]
+
+
+class ChunkMemo:
+    """
+    Persistent memo of generated chunk summaries.
+
+    Keys combine the chunk text hash, the decoding parameters and a model
+    fingerprint, so a change to any of them regenerates the chunk.
+    """
+
+    def __init__(self, cache: PersistentLRUCache, fingerprint: str):
+        self.cache = cache
+        self.fingerprint = fingerprint
+
+    def _keys(self, texts: List[str], gen_kwargs: Dict, max_input_tokens: int) -> List[str]:
+        params = json.dumps(dict(gen_kwargs, max_input_tokens=max_input_tokens), sort_keys=True)
+        params_hash = hashlib.sha1(params.encode("utf-8")).hexdigest()[:12]
+        return [f"{self.fingerprint}:{params_hash}:{text_hash(t)}" for t in texts]
+
+    def summarize(
+        self,
+        texts: List[str],
+        tokenizer,
+        model,
+        device,
+        gen_kwargs: Dict,
+        max_input_tokens: int = MAX_INPUT_TOKENS,
+        max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+        deadline: Optional[Deadline] = None,
+    ) -> List[str]:
+        """
+        Same contract as ``summarize_batch``; only chunks missing from the
+        memo are generated. Summaries from a call that ran into the deadline
+        may be cut short and are not memoized.
+        """
+        keys = self._keys(texts, gen_kwargs, max_input_tokens)
+        found = self.cache.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            summaries = summarize_batch(
+                list(missing.values()), tokenizer, model, device, gen_kwargs,
+                max_input_tokens=max_input_tokens, max_batch_tokens=max_batch_tokens,
+                deadline=deadline
+            )
+            fresh = dict(zip(missing, summaries))
+            if deadline is None or not deadline.missed:
+                self.cache.put_many(fresh)
+            found.update(fresh)
+
+        return [found[k] for k in keys]
@@ -0,0 +1,112 @@
+# src/t5_model.py
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import torch
+from transformers import T5Config, T5ForConditionalGeneration
+
+from src.shared_weights import load_shared_weights
+
+logger = logging.getLogger(__name__)
+
+MERGE_INFO_FILE = "merge_info.json"
+
+
+def adapter_hash(adapter_path) -> str:
+    """
+    Content hash of a LoRA adapter (config and weights).
+    """
+    h = hashlib.sha256()
+    root = Path(adapter_path)
+    for p in sorted(root.glob("adapter_*")):
+        if p.is_file():
+            h.update(p.name.encode())
+            h.update(p.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def merged_is_current(merged_dir, adapter_path) -> bool:
+    info_path = Path(merged_dir) / MERGE_INFO_FILE
+    if not info_path.exists():
+        return False
+    with open(info_path, encoding="utf-8") as f:
+        info = json.load(f)
+    return info.get("adapter_hash") == adapter_hash(adapter_path)
+
+
+def merge_adapter(base_name: str, adapter_path, merged_dir):
+    """
+    Folds the LoRA adapter into the base weights and saves one safetensors
+    checkpoint tagged with the adapter hash.
+    """
+    from peft import PeftModel
+
+    base = T5ForConditionalGeneration.from_pretrained(base_name, torch_dtype=torch.float32)
+    merged = PeftModel.from_pretrained(base, adapter_path).merge_and_unload()
+
+    merged_dir = Path(merged_dir)
+    merged.save_pretrained(merged_dir, safe_serialization=True)
+    with open(merged_dir / MERGE_INFO_FILE, "w", encoding="utf-8") as f:
+        json.dump({
+            "base_model": base_name,
+            "adapter_path": str(adapter_path),
+            "adapter_hash": adapter_hash(adapter_path),
+        }, f, indent=2)
+    return merged
+
+
+def quantize_int8(model):
+    """
+    Dynamic int8 quantization of all Linear layers, for CPU inference.
+    """
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_t5_model(
+    base_name: str, adapter_path, merged_dir, device, int8: bool = False, mmap_weights: bool = False
+):
+    """
+    Loads the fine-tuned T5 model, preferring an up-to-date merged checkpoint.
+
+    Falls back to base model + LoRA adapter when the merged checkpoint is
+    missing or was built from a different adapter. With ``int8`` on a CPU
+    device the (merged) weights are dynamically quantized to int8. With
+    ``mmap_weights`` on a CPU device the merged checkpoint is memory-mapped
+    so worker processes share one copy of the weights; this does not apply
+    to the adapter fallback or to int8, which build their own weights.
+    """
+    cpu = torch.device(device).type == "cpu"
+    int8 = int8 and cpu
+    dtype = torch.float16 if torch.cuda.is_available() and not int8 else torch.float32
+
+    if merged_is_current(merged_dir, adapter_path):
+        model = None
+        if mmap_weights and cpu and not int8:
+            logger.info(f"Memory-mapping merged T5 checkpoint from {merged_dir}")
+            config = T5Config.from_pretrained(merged_dir)
+            model = load_shared_weights(T5ForConditionalGeneration(config), merged_dir)
+        if model is None:
+            logger.info(f"Loading merged T5 checkpoint from {merged_dir}")
+            model = T5ForConditionalGeneration.from_pretrained(merged_dir, torch_dtype=dtype)
+    else:
+        from peft import PeftModel
+
+        logger.info(
+            f"No up-to-date merged checkpoint in {merged_dir}; loading adapter "
+            f"(run scripts/merge_t5_adapter.py to speed this up)"
+        )
+        base = T5ForConditionalGeneration.from_pretrained(base_name, torch_dtype=dtype)
+        model = PeftModel.from_pretrained(base.to(device), adapter_path)
+        if int8:
+            # Quantized Linear layers cannot host LoRA adapters, so merge first
+            model = model.merge_and_unload()
+
+    model = model.to(device)
+    model.eval()
+    if int8:
+        logger.info("Quantizing T5 to dynamic int8 for CPU inference")
+        model = quantize_int8(model)
+    return model
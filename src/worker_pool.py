@@ -0,0 +1,257 @@
+# src/worker_pool.py
+
+import logging
+import multiprocessing as mp
+import os
+import time
+import traceback
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.runtime_config import THREADS_ENV, configure_runtime, slot_cpus, threads_per_slot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ITEMS_PER_TASK = 8
+POLL_SECONDS = 0.5
+
+
+def _worker_main(slot, workers, cpus, pin, init_fn, init_args, work_fn, tasks, results):
+    # ``results`` is this worker's own pipe, so a worker that dies mid-send
+    # cannot leave a lock held that the other workers need
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    configure_runtime(
+        threads=threads_per_slot(workers, cpus),
+        interop_threads=1,
+        affinity=slot_cpus(slot, workers) if pin else None,
+    )
+    state = init_fn(*init_args)
+    results.send(("ready", None, None))
+
+    while True:
+        task = tasks.recv()
+        if task is None:
+            break
+        task_id, items = task
+        try:
+            results.send(("done", task_id, work_fn(state, items)))
+        except Exception:
+            results.send(("error", task_id, traceback.format_exc()))
+
+
+def add_pool_arguments(parser):
+    """
+    Command-line options shared by the stage scripts that can run a pool.
+    """
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="model-holding worker processes sharing this process' cores"
+    )
+    parser.add_argument("--pin-workers", action="store_true", help="pin each worker to its own cores")
+    parser.add_argument(
+        "--mmap-weights", action="store_true",
+        help="memory-map the safetensors checkpoint so workers share one copy of the weights (CPU)"
+    )
+    parser.add_argument(
+        "--pool-timeout", type=float, default=None,
+        help="give up on the worker pool after this many seconds"
+    )
+
+
+class ModelWorkerPool:
+    """
+    Data-parallel pool of processes that each hold their own model.
+
+    ``init_fn(*init_args)`` runs once per worker and returns its state (the
+    loaded model); ``work_fn(state, items)`` maps a list of items to a list
+    of outputs. Both must be importable top-level functions. Each worker
+    gets an equal share of the cores allotted to this process.
+
+    Items are sent in small tasks to whichever worker is idle, so uneven
+    document lengths balance out. The parent tracks what each worker holds:
+    if a worker raises or dies, its task is split into single items and
+    retried (on a fresh worker if it died), and items that still fail after
+    ``max_retries`` are reported in ``failures`` with a ``None`` output.
+    """
+
+    def __init__(
+        self,
+        init_fn: Callable,
+        work_fn: Callable[[Any, List], List],
+        workers: int,
+        init_args: Sequence = (),
+        pin: bool = False,
+        max_retries: int = 1,
+        items_per_task: int = DEFAULT_ITEMS_PER_TASK,
+        timeout: Optional[float] = None,
+    ):
+        self.init_fn = init_fn
+        self.init_args = tuple(init_args)
+        self.work_fn = work_fn
+        self.workers = max(1, workers)
+        self.pin = pin
+        self.max_retries = max_retries
+        self.items_per_task = max(1, items_per_task)
+        self.timeout = timeout
+        # Split this process' own allotment, e.g. a backend inference slot
+        self.cpus = int(os.environ.get(THREADS_ENV, 0)) or None
+        self.failures: Dict[int, str] = {}
+
+        self._ctx = mp.get_context("spawn")
+        self._procs: List[Optional[mp.Process]] = [None] * self.workers
+        self._tasks: List = [None] * self.workers
+        self._results: List = [None] * self.workers
+        self._ready = set()
+        for slot in range(self.workers):
+            self._start(slot)
+
+    def _start(self, slot: int):
+        task_recv, task_send = self._ctx.Pipe(duplex=False)
+        result_recv, result_send = self._ctx.Pipe(duplex=False)
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(slot, self.workers, self.cpus, self.pin, self.init_fn, self.init_args,
+                  self.work_fn, task_recv, result_send),
+            daemon=True,
+        )
+        proc.start()
+        # Drop the parent's copies of the worker ends so a dead worker shows as EOF
+        task_recv.close()
+        result_send.close()
+        self._procs[slot] = proc
+        self._tasks[slot] = task_send
+        self._results[slot] = result_recv
+
+    @property
+    def pids(self) -> List[int]:
+        return [proc.pid for proc in self._procs]
+
+    def map(self, items: Sequence, on_output: Optional[Callable[[int, object], None]] = None) -> List:
+        """
+        Processes ``items`` across the workers and returns the outputs in
+        input order. ``on_output(index, output)`` is called as each output
+        arrives. Raises ``TimeoutError`` if the pool's ``timeout`` runs out
+        first.
+        """
+        self.failures = {}
+        outputs = [None] * len(items)
+        attempts = [0] * len(items)
+        pending = [
+            list(range(i, min(i + self.items_per_task, len(items))))
+            for i in range(0, len(items), self.items_per_task)
+        ]
+        pending.reverse()                   # pop() hands out tasks in input order
+        assigned: Dict[int, tuple] = {}     # slot -> (task id, item indices) in flight
+        ready = self._ready
+        task_ids = iter(range(1 << 62))
+        started = time.monotonic()
+
+        def dispatch():
+            for slot in sorted(ready - set(assigned)):
+                if not pending:
+                    return
+                task_id, idx = next(task_ids), pending.pop()
+                assigned[slot] = (task_id, idx)
+                self._tasks[slot].send((task_id, [items[i] for i in idx]))
+
+        def fail(idx: List[int], reason: str):
+            if len(idx) > 1:
+                # Isolate the item that broke the task before counting attempts
+                pending.extend([i] for i in reversed(idx))
+                return
+            i = idx[0]
+            attempts[i] += 1
+            if attempts[i] > self.max_retries:
+                logger.error(f"Item {i} failed after {attempts[i]} attempts: {reason}")
+                self.failures[i] = reason
+            else:
+                logger.warning(f"Retrying item {i} after failure: {reason}")
+                pending.append(idx)
+
+        def restart(slot: int):
+            proc = self._procs[slot]
+            proc.join(timeout=5)
+            reason = f"worker {slot} exited with code {proc.exitcode}"
+            if slot in assigned:
+                fail(assigned.pop(slot)[1], reason)
+            elif slot not in ready:
+                raise RuntimeError(f"{reason} while loading its model")
+            ready.discard(slot)
+            logger.warning(f"Restarting {reason}")
+            self._tasks[slot].close()
+            self._results[slot].close()
+            self._start(slot)
+
+        def receive(slot: int):
+            kind, task_id, payload = self._results[slot].recv()
+            if kind == "ready":
+                ready.add(slot)
+                return
+            # Replies are matched by task id, so nothing stale is misattributed
+            if slot not in assigned or assigned[slot][0] != task_id:
+                return
+            idx = assigned.pop(slot)[1]
+            if kind == "done":
+                for i, out in zip(idx, payload):
+                    outputs[i] = out
+                    if on_output is not None:
+                        on_output(i, out)
+            else:
+                fail(idx, payload)
+
+        while pending or assigned:
+            if self.timeout is not None and time.monotonic() - started > self.timeout:
+                # Replace the stuck workers so the pool stays usable
+                for slot in assigned:
+                    self._procs[slot].terminate()
+                    self._procs[slot].join()
+                    ready.discard(slot)
+                    self._tasks[slot].close()
+                    self._results[slot].close()
+                    self._start(slot)
+                raise TimeoutError(f"Worker pool did not finish within {self.timeout}s")
+            dispatch()
+
+            conns = {conn: slot for slot, conn in enumerate(self._results)}
+            sentinels = {proc.sentinel: slot for slot, proc in enumerate(self._procs)}
+            dead = set()
+            for obj in wait(list(conns) + list(sentinels), timeout=POLL_SECONDS):
+                if obj in conns:
+                    try:
+                        receive(conns[obj])
+                    except (EOFError, OSError):
+                        dead.add(conns[obj])
+                else:
+                    dead.add(sentinels[obj])
+
+            for slot in dead:
+                # Collect a reply that was sent just before the worker exited
+                try:
+                    while self._results[slot].poll():
+                        receive(slot)
+                except (EOFError, OSError):
+                    pass
+                if not self._procs[slot].is_alive():
+                    restart(slot)
+
+        return outputs
+
+    def close(self):
+        for slot, proc in enumerate(self._procs):
+            if proc.is_alive():
+                try:
+                    self._tasks[slot].send(None)
+                except OSError:
+                    pass
+        for proc in self._procs:
+            proc.join(timeout=30)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._tasks + self._results:
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
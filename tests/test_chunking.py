@@ -0,0 +1,44 @@
+import re
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from chunking import chunk_by_sentences, sentence_spans
+
+
+class WhitespaceTokenizer:
+    """
+    One token per word, with character offsets like a fast tokenizer.
+    """
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=False):
+        return {"offset_mapping": [m.span() for m in re.finditer(r"\S+", text)]}
+
+
+TEXT = (
+    "The appellant was convicted under Section 302. "
+    "The High Court confirmed the sentence. "
+    "Counsel argued the evidence was circumstantial. "
+    "The appeal is dismissed."
+)
+
+
+def test_sentence_spans_cover_each_sentence():
+    spans = sentence_spans(TEXT)
+    assert [TEXT[s:e] for s, e in spans][-1] == "The appeal is dismissed."
+    assert len(spans) == 4
+
+
+def test_chunks_keep_sentences_whole():
+    chunks = chunk_by_sentences(TEXT, WhitespaceTokenizer(), max_tokens=13)
+    assert chunks == [
+        "The appellant was convicted under Section 302. The High Court confirmed the sentence.",
+        "Counsel argued the evidence was circumstantial. The appeal is dismissed.",
+    ]
+
+
+def test_oversized_sentence_is_split_at_token_boundaries():
+    chunks = chunk_by_sentences("one two three four five six seven.", WhitespaceTokenizer(), max_tokens=3)
+    assert chunks == ["one two three", "four five six", "seven."]
+    assert all(len(c.split()) <= 3 for c in chunks)
@@ -0,0 +1,59 @@
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import dataset_shards
+from src.dataset_shards import iter_json_array, iter_split, load_manifest, write_shards
+
+
+def make_records(n, source="ilc"):
+    return [
+        {"uid": f"{source}_{i:06d}", "source": source, "text": f"Judgment number {i} of {source}.",
+         "summary": f"Summary {i}."}
+        for i in range(n)
+    ]
+
+
+def assignments(root):
+    return {r["uid"]: split for split in ("train", "val") for r in iter_split(root, split)}
+
+
+def test_json_array_is_streamed_in_chunks(tmp_path, monkeypatch):
+    records = make_records(20)
+    path = tmp_path / "cleaned.json"
+    path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    monkeypatch.setattr(dataset_shards, "READ_CHUNK_CHARS", 7)
+    assert list(iter_json_array(path)) == records
+
+
+def test_duplicates_dropped_and_shards_bounded(tmp_path):
+    records = make_records(50)
+    # Same text up to whitespace, from the other source
+    dup = dict(records[3], uid="inabs_000000", source="inabs", text="  Judgment number 3\nof ilc. ")
+    manifest = write_shards(records + [dup], tmp_path, val_fraction=0.2, max_bytes=1000)
+
+    assert manifest["duplicates_dropped"] == 1
+    assert manifest["sources"] == {"ilc": 50}
+    assert load_manifest(tmp_path) == manifest
+    for split in manifest["splits"].values():
+        assert all(s["bytes"] <= 1000 for s in split["shards"])
+
+    train, val = (list(iter_split(tmp_path, s)) for s in ("train", "val"))
+    assert len(train) + len(val) == 50 and val
+    assert not {r["uid"] for r in train} & {r["uid"] for r in val}
+
+
+def test_adding_data_keeps_existing_assignments(tmp_path):
+    write_shards(make_records(40), tmp_path / "before", val_fraction=0.3)
+    write_shards(make_records(40) + make_records(40, "inabs"), tmp_path / "after", val_fraction=0.3)
+
+    before, after = assignments(tmp_path / "before"), assignments(tmp_path / "after")
+    assert all(after[uid] == split for uid, split in before.items())
+
+
+def test_excluded_uids_are_left_out(tmp_path):
+    manifest = write_shards(make_records(10), tmp_path, exclude={"ilc_000002", "ilc_000005"})
+    assert manifest["excluded"] == 2
+    assert "ilc_000002" not in assignments(tmp_path)
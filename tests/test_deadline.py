@@ -0,0 +1,54 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.deadline import (
+    LEGALBERT_LOAD_SECONDS, MODEL_LOAD_SECONDS, SECONDS_PER_CHUNK, SECONDS_PER_DOCUMENT,
+    Deadline, legalbert_seconds, plan_for_budget
+)
+
+
+def test_generous_budget_keeps_requested_profile():
+    plan = plan_for_budget(3600, [2000], "quality")
+    assert plan["profile"] == "quality"
+    assert plan["token_budget"] is None
+    assert not plan["degraded"]
+
+
+def test_tight_budget_downgrades_profile_before_shrinking_extract():
+    plan = plan_for_budget(60, [3000], "quality")
+    assert plan["profile"] != "quality"
+    assert plan["token_budget"] is None
+    assert plan["degraded"]
+
+
+def test_impossible_budget_runs_one_chunk():
+    plan = plan_for_budget(1, [3000, 5000], "balanced")
+    assert plan["profile"] == "fast"
+    assert plan["chunks_per_document"] == 1
+    assert plan["token_budget"] == 300
+
+
+def test_deadline_marks_missed_once_expired():
+    deadline = Deadline.after(-1)
+    assert deadline.remaining() == 0.0
+    assert deadline.expired()
+    assert deadline.missed
+    assert not Deadline.after(60).expired()
+
+
+def test_legalbert_time_comes_off_the_budget():
+    # Long documents cost LegalBERT time, leaving less for generation
+    assert legalbert_seconds([30_000]) > legalbert_seconds([3_000]) > LEGALBERT_LOAD_SECONDS
+    plan = plan_for_budget(120, [60_000], "fast")
+    ignoring_bert = (120 - MODEL_LOAD_SECONDS - SECONDS_PER_DOCUMENT["fast"]) // SECONDS_PER_CHUNK["fast"]
+    assert plan["token_budget"] is not None
+    assert plan["chunks_per_document"] < ignoring_bert
+
+
+def test_workers_split_documents():
+    docs = [3000] * 8
+    single = plan_for_budget(300, docs, "quality")
+    pooled = plan_for_budget(300, docs, "quality", workers=4)
+    assert single["degraded"] and not pooled["degraded"]
@@ -0,0 +1,38 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.intermediate_store import MemoryStore, open_store, read_records, write_records
+
+RECORDS = [
+    {"id": "ilc_0", "text": "Appeal allowed under Section 482 — costs to the appellant."},
+    {"id": "ilc_1", "text": "Petition dismissed.", "degraded": True},
+]
+
+
+@pytest.mark.parametrize("fmt", ["json", "msgpack", "arrow"])
+def test_records_round_trip(tmp_path, fmt):
+    if fmt == "msgpack":
+        pytest.importorskip("msgpack")
+    if fmt == "arrow":
+        pytest.importorskip("pyarrow")
+    store = open_store(tmp_path, fmt)
+    store.save("cleaned", RECORDS)
+    assert store.load("cleaned") == RECORDS
+    assert read_records(tmp_path / store.name("cleaned")) == RECORDS
+
+
+def test_json_export_is_only_written_on_request(tmp_path):
+    store = MemoryStore(tmp_path)
+    store.save("final", RECORDS)
+    assert not (tmp_path / "final.json").exists()
+    path = store.export_json("final")
+    assert read_records(path) == RECORDS
+
+
+def test_unknown_extension_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_records(tmp_path / "out.csv", RECORDS)
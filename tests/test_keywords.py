@@ -0,0 +1,46 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.keywords import KeywordIndex
+
+KEYWORDS = ["section", "sections", "appeal", "Full Bench"]
+
+TEXT = (
+    "The appeal arises from a Full Bench decision. "
+    "Sections 3 and 4 were considered. "
+    "The appeal arises from a Full Bench decision. "
+    "Costs are awarded under section 35."
+)
+
+
+def legacy_find_keyword_sentences(text, limit):
+    sents = [s.strip() for s in text.split(". ") if s.strip()]
+    sents = [s if s.endswith(".") else s + "." for s in sents]
+    found = []
+    lowered = [s.lower() for s in sents]
+    for kw in KEYWORDS:
+        for i, s in enumerate(lowered):
+            if kw.lower() in s and sents[i] not in found:
+                found.append(sents[i])
+                if len(found) >= limit:
+                    return found
+    return found
+
+
+def test_keyword_sentences_match_legacy_order():
+    index = KeywordIndex(KEYWORDS)
+    for limit in range(1, 5):
+        assert index.keyword_sentences(TEXT, limit) == legacy_find_keyword_sentences(TEXT, limit)
+
+
+def test_prefix_keywords_are_both_reported():
+    index = KeywordIndex(KEYWORDS)
+    assert index.count_keywords("Sections 3 and 4 apply.") == 2
+
+
+def test_matching_sentences_keep_document_order():
+    index = KeywordIndex(["dismissed", "allowed"])
+    text = "The appeal is allowed. Facts follow. The petition is dismissed."
+    assert index.matching_sentences(text) == ["The appeal is allowed.", "The petition is dismissed."]
@@ -0,0 +1,37 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip("numpy")
+
+from src.lexical_scorer import lexical_scores, prefilter_sentences
+
+SENTENCES = [
+    "The facts are briefly stated.",
+    "The FIR was registered under Section 498A of the Penal Code.",
+    "Counsel were heard.",
+    "Accordingly, the appeal is dismissed.",
+]
+
+
+def test_scores_keywords_sections_and_length():
+    scores = lexical_scores(SENTENCES).tolist()
+    assert scores[0] == 0 and scores[2] == 0
+    # "fir" and "section", plus a section citation
+    assert scores[1] == 3 * 2 + 2
+    # "accordingly" and "appeal is dismissed"
+    assert scores[3] == 3 * 2
+    assert len(lexical_scores([])) == 0
+
+
+def test_prefilter_keeps_document_order():
+    assert prefilter_sentences(SENTENCES, 1) == [SENTENCES[1], SENTENCES[3]]
+    assert prefilter_sentences(SENTENCES, None) == SENTENCES
+
+
+def test_prefilter_returns_everything_when_nothing_survives():
+    assert prefilter_sentences(SENTENCES, 100) == SENTENCES
+    assert prefilter_sentences([], 1) == []
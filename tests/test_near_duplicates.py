@@ -0,0 +1,62 @@
+import random
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+np = pytest.importorskip("numpy")
+
+from src.near_duplicates import MinHasher, cluster_report, duplicate_clusters, excluded_uids, shingle_hashes
+
+WORDS = [f"w{i}" for i in range(2000)]
+
+
+def judgment(rng, n=400):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def edited(rng, text, changes):
+    words = text.split()
+    for i in rng.sample(range(len(words)), changes):
+        words[i] = "edited"
+    return " ".join(words)
+
+
+def jaccard(a, b):
+    a, b = set(shingle_hashes(a).tolist()), set(shingle_hashes(b).tolist())
+    return len(a & b) / len(a | b)
+
+
+def test_signature_agreement_estimates_jaccard():
+    rng = random.Random(0)
+    hasher = MinHasher(num_perm=256)
+    base = judgment(rng)
+    for changes in (2, 10, 40):
+        other = edited(rng, base, changes)
+        estimate = np.mean(hasher.signature(base) == hasher.signature(other))
+        assert estimate == pytest.approx(jaccard(base, other), abs=0.1)
+
+
+def test_near_duplicates_cluster_and_distinct_documents_do_not():
+    rng = random.Random(1)
+    docs = [judgment(rng) for _ in range(30)]
+    docs.append(edited(rng, docs[4], 3))            # light edit of 4
+    docs.append(edited(rng, docs[4], 4))            # another copy of 4
+    docs.append(edited(rng, docs[17], 2))           # light edit of 17
+    docs.append(edited(rng, docs[9], 150))          # heavily rewritten, not a duplicate
+
+    clusters = duplicate_clusters(MinHasher().signatures(docs))
+    assert [sorted(members) for members, _ in clusters] == [[4, 30, 31], [17, 32]]
+    assert all(sim >= 0.8 for _, sim in clusters)
+
+
+def test_report_and_exclusion_policies():
+    uids = ["ilc_0", "ilc_1", "inabs_0", "inabs_1"]
+    sources = ["ilc", "ilc", "inabs", "inabs"]
+    report = cluster_report(uids, sources, [([0, 2], 0.9)])
+
+    assert report["cross_source_clusters"] == 1 and report["documents_in_clusters"] == 2
+    assert excluded_uids(report) == {"inabs_0"}
+    assert excluded_uids(report, "drop-all") == {"ilc_0", "inabs_0"}
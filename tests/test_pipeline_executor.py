@@ -0,0 +1,75 @@
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pipeline_executor import Stage, StreamingPipeline, parse_result, report_result
+
+
+def slow(fn, seconds):
+    def run(items):
+        time.sleep(seconds * len(items))
+        return [fn(x) for x in items]
+    return run
+
+
+def test_outputs_keep_input_order_and_drop_none():
+    pipeline = StreamingPipeline([
+        Stage("double", lambda xs: [x * 2 for x in xs], batch_size=3),
+        Stage("odd_tens", lambda xs: [None if x % 4 == 0 else x for x in xs]),
+    ], queue_size=2)
+    assert pipeline.run(range(10)) == [2, 6, 10, 14, 18]
+
+
+def test_stages_overlap():
+    stages = [Stage(name, slow(lambda x: x, 0.05)) for name in ("clean", "extract", "summarize")]
+    start = time.perf_counter()
+    out = StreamingPipeline(stages, queue_size=2).run(range(10))
+    elapsed = time.perf_counter() - start
+    assert out == list(range(10))
+    # Sequential would take 3 x 10 x 0.05 = 1.5s; streaming is close to one stage's 0.5s
+    assert elapsed < 1.0
+
+
+def test_bounded_queues_apply_backpressure():
+    fed = []
+    lock = threading.Lock()
+
+    def source():
+        for i in range(20):
+            with lock:
+                fed.append(i)
+            yield i
+
+    seen_ahead = []
+
+    def slow_sink(xs):
+        time.sleep(0.02)
+        with lock:
+            seen_ahead.append(len(fed) - xs[0])
+        return xs
+
+    StreamingPipeline([Stage("sink", slow_sink)], queue_size=2).run(source())
+    # The feeder never runs more than queue size + in-flight items ahead
+    assert max(seen_ahead) <= 4
+
+
+def test_stage_error_is_raised():
+    def boom(xs):
+        if 5 in xs:
+            raise ValueError("bad document")
+        return xs
+
+    with pytest.raises(ValueError, match="bad document"):
+        StreamingPipeline([Stage("a", boom), Stage("b", lambda xs: xs)], queue_size=1).run(range(100))
+
+
+def test_reported_results_parse_back(capsys):
+    report_result({"id": "ilc_0", "summary_text": "The appeal is dismissed — with costs."})
+    line = capsys.readouterr().out
+    assert parse_result(line) == {"id": "ilc_0", "summary_text": "The appeal is dismissed — with costs."}
+    assert parse_result("T5 summaries saved to final.arrow\n") is None
@@ -0,0 +1,100 @@
+import random
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rouge import (
+    RougeEvaluator, RunningRouge, evaluate, lcs_length, lcs_masks, per_sample_records,
+    rouge1_fmeasures, tokenize
+)
+
+
+def lcs_table(a, b):
+    table = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            table[i + 1][j + 1] = table[i][j] + 1 if x == y else max(table[i][j + 1], table[i + 1][j])
+    return table[-1][-1]
+
+
+def test_bit_parallel_lcs_matches_dynamic_programming():
+    rng = random.Random(0)
+    for _ in range(500):
+        a = [rng.choice("abcd") for _ in range(rng.randint(0, 40))]
+        b = [rng.choice("abcde") for _ in range(rng.randint(0, 40))]
+        assert lcs_length(lcs_masks(a), len(a), b) == lcs_table(a, b)
+
+
+def test_scores_without_stemming():
+    evaluator = RougeEvaluator(use_stemmer=False)
+    s = evaluator.score("the appeal is dismissed", "the appeal is allowed today")
+
+    assert tokenize("The Appeal, is-dismissed!", use_stemmer=False) == ["the", "appeal", "is", "dismissed"]
+    assert s["rouge1"].precision == pytest.approx(3 / 5)
+    assert s["rouge1"].recall == pytest.approx(3 / 4)
+    assert s["rouge2"].fmeasure == pytest.approx(2 * (2 / 4) * (2 / 3) / (2 / 4 + 2 / 3))
+    assert s["rougeL"].recall == pytest.approx(3 / 4)
+    assert evaluator.score("", "anything")["rouge1"].fmeasure == 0.0
+
+
+def test_references_are_tokenized_once():
+    evaluator = RougeEvaluator(use_stemmer=False)
+    evaluator.score("the appeal is dismissed", "a")
+    ref = evaluator.references["the appeal is dismissed"]
+    evaluator.score("the appeal is dismissed", "b")
+    assert evaluator.references["the appeal is dismissed"] is ref
+
+
+def test_pool_keeps_order_and_matches_serial():
+    rng = random.Random(1)
+    words = ["court", "appeal", "section", "order", "held", "petition", "the", "is"]
+    pairs = [
+        (" ".join(rng.choices(words, k=30)), " ".join(rng.choices(words, k=20)))
+        for _ in range(200)
+    ]
+    serial = evaluate(pairs, use_stemmer=False)
+    assert evaluate(pairs, use_stemmer=False, workers=2) == serial
+
+    rows = per_sample_records(range(len(pairs)), serial)
+    assert rows[5]["id"] == 5 and rows[5]["rougeL_f"] == serial[5]["rougeL"].fmeasure
+
+
+def test_matches_rouge_score():
+    rouge_scorer = pytest.importorskip("rouge_score.rouge_scorer")
+    pytest.importorskip("nltk")
+
+    reference = "The appellants challenged the orders passed by the High Court under Section 482."
+    prediction = "The High Court passed orders; the appellants challenged them under section 482 CrPC."
+    expected = rouge_scorer.RougeScorer(["rouge1", "rouge2", "rougeL"], use_stemmer=True).score(
+        reference, prediction
+    )
+    ours = RougeEvaluator().score(reference, prediction)
+    for metric in expected:
+        assert ours[metric].fmeasure == pytest.approx(expected[metric].fmeasure)
+
+
+def test_running_rouge_averages_scores_so_far():
+    evaluator = RougeEvaluator(use_stemmer=False)
+    running = RunningRouge()
+    assert running.summary() == {"samples": 0, "rouge1": 0.0, "rouge2": 0.0, "rougeL": 0.0}
+
+    running.add(evaluator.score("the appeal is dismissed", "the appeal is dismissed"))
+    running.add(evaluator.score("the appeal is dismissed", "costs awarded"))
+    assert running.summary() == {"samples": 2, "rouge1": 50.0, "rouge2": 50.0, "rougeL": 50.0}
+
+
+def test_vectorized_rouge1_matches_per_sentence_scores():
+    evaluator = RougeEvaluator(["rouge1"], use_stemmer=False)
+    summary = "the appeal is dismissed and the order of the high court is upheld"
+    sentences = [
+        "The appeal is dismissed.",
+        "Nothing in common here.",
+        "",
+        "the the the court court order",
+    ]
+    expected = [evaluator.score(summary, s)["rouge1"].fmeasure for s in sentences]
+    scores = rouge1_fmeasures(evaluator.reference(summary), [tokenize(s, use_stemmer=False) for s in sentences])
+    assert list(scores) == pytest.approx(expected)
@@ -0,0 +1,45 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+np = pytest.importorskip("numpy")
+
+from src import rouge_stats
+from src.rouge_stats import bootstrap_ci, bootstrap_means, paired_bootstrap, permutation_test
+
+
+def test_ci_brackets_the_mean_and_narrows_with_more_samples():
+    rng = np.random.default_rng(1)
+    small = bootstrap_ci(rng.normal(40, 10, 30), n_resamples=2000)
+    large = bootstrap_ci(rng.normal(40, 10, 3000), n_resamples=2000)
+    assert small["low"] < small["mean"] < small["high"]
+    assert large["high"] - large["low"] < (small["high"] - small["low"]) / 5
+
+
+def test_blocked_resampling_matches_unblocked(monkeypatch):
+    scores = np.arange(50, dtype=float).reshape(25, 2)
+    whole = bootstrap_means(scores, n_resamples=300, seed=3)
+    monkeypatch.setattr(rouge_stats, "MAX_CELLS_PER_BLOCK", 25 * 7)
+    blocked = bootstrap_means(scores, n_resamples=300, seed=3)
+    assert whole.shape == blocked.shape == (300, 2)
+    # Metric columns are resampled with the same sample indices
+    assert np.allclose(whole[:, 1] - whole[:, 0], 1)
+    assert np.allclose(np.sort(whole[:, 0]).mean(), np.sort(blocked[:, 0]).mean(), atol=1.0)
+
+
+def test_paired_tests_separate_real_and_null_differences():
+    rng = np.random.default_rng(2)
+    base = rng.normal(45, 8, 200)
+    better = base + 1.5 + rng.normal(0, 1, 200)
+    same = base + rng.normal(0, 1, 200)
+
+    real = paired_bootstrap(better, base, n_resamples=2000)
+    assert real["low"] > 0 and real["p_value"] < 0.01
+    assert permutation_test(better, base, n_resamples=2000) < 0.01
+
+    null = paired_bootstrap(same, base, n_resamples=2000)
+    assert null["low"] < 0 < null["high"]
+    assert permutation_test(same, base, n_resamples=2000) > 0.05
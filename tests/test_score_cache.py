@@ -0,0 +1,59 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from score_cache import PersistentLRUCache, model_fingerprint, text_hash
+
+
+def test_normalized_sentences_share_a_key():
+    assert text_hash("The appeal  is\ndismissed.") == text_hash(" The appeal is dismissed. ")
+    assert text_hash("The appeal is dismissed.") != text_hash("The appeal is allowed.")
+
+
+def test_fingerprint_can_ignore_exported_graphs(tmp_path):
+    (tmp_path / "model.bin").write_bytes(b"weights")
+    (tmp_path / "onnx").mkdir()
+    before = model_fingerprint(tmp_path, "torch", exclude=["onnx"])
+    (tmp_path / "onnx" / "model.onnx").write_bytes(b"graph")
+    assert model_fingerprint(tmp_path, "torch", exclude=["onnx"]) == before
+    assert model_fingerprint(tmp_path, "torch") != before
+
+
+def test_cache_persists_and_counts_hits(tmp_path):
+    path = tmp_path / "scores.sqlite"
+
+    cache = PersistentLRUCache(path, max_memory_entries=1)
+    cache.put_many({"a": 0.25, "b": 0.75})
+    assert cache.get_many(["a", "b", "c"]) == {"a": 0.25, "b": 0.75}
+    assert (cache.hits, cache.misses) == (2, 1)
+    cache.close()
+
+    reopened = PersistentLRUCache(path)
+    assert reopened.get_many(["b"]) == {"b": 0.75}
+    reopened.close()
+
+
+def test_disk_eviction_keeps_most_recent(tmp_path):
+    cache = PersistentLRUCache(tmp_path / "memo.sqlite", max_memory_entries=0, max_disk_entries=2)
+    for i, key in enumerate(["x", "y", "z"]):
+        cache.put_many({key: f"summary {i}"})
+    assert set(cache.get_many(["x", "y", "z"])) == {"y", "z"}
+    cache.close()
+
+
+def test_cache_is_usable_from_another_thread(tmp_path):
+    import threading
+
+    cache = PersistentLRUCache(tmp_path / "scores.sqlite", max_memory_entries=0)
+    found = {}
+
+    def use_cache():
+        cache.put_many({"a": 1.0})
+        found.update(cache.get_many(["a"]))
+
+    worker = threading.Thread(target=use_cache)
+    worker.start()
+    worker.join()
+    assert found == {"a": 1.0}
+    cache.close()
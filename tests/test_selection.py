@@ -0,0 +1,32 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from selection import select_by_ratio, select_by_token_budget
+
+SENTS = ["Facts of the case.", "Section 302 applies.", "Arguments heard.", "The appeal is dismissed."]
+PROBS = [0.2, 0.9, 0.1, 0.8]
+
+
+def test_ratio_selection_keeps_score_order():
+    assert select_by_ratio(SENTS, PROBS, 0.5) == ["Section 302 applies.", "The appeal is dismissed."]
+
+
+def test_budget_selection_restores_document_order():
+    counts = [4, 5, 3, 6]
+    assert select_by_token_budget(SENTS, PROBS, counts, 11) == [
+        "Section 302 applies.", "The appeal is dismissed."
+    ]
+
+
+def test_budget_selection_skips_sentences_that_do_not_fit():
+    counts = [3, 5, 3, 10]
+    # 0.8 sentence overflows, so the next best ones fill the budget instead
+    assert select_by_token_budget(SENTS, PROBS, counts, 11) == [
+        "Facts of the case.", "Section 302 applies.", "Arguments heard."
+    ]
+
+
+def test_budget_selection_always_keeps_best_sentence():
+    assert select_by_token_budget(SENTS, PROBS, [50, 50, 50, 50], 10) == ["Section 302 applies."]
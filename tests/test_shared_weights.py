@@ -0,0 +1,40 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+torch = pytest.importorskip("torch")
+safetensors_torch = pytest.importorskip("safetensors.torch")
+
+from src.shared_weights import load_shared_weights, mmap_safetensors
+
+
+def test_mmap_matches_saved_tensors(tmp_path):
+    tensors = {
+        "weight": torch.randn(4, 3),
+        "bias": torch.randn(3).half(),
+        "steps": torch.arange(5),
+    }
+    path = tmp_path / "model.safetensors"
+    safetensors_torch.save_file(tensors, str(path))
+
+    loaded = mmap_safetensors(path)
+    assert set(loaded) == set(tensors)
+    for name, t in tensors.items():
+        assert loaded[name].dtype == t.dtype
+        assert torch.equal(loaded[name], t)
+
+
+def test_load_shared_weights_replaces_parameters(tmp_path):
+    source = torch.nn.Linear(3, 2)
+    safetensors_torch.save_file(source.state_dict(), str(tmp_path / "model.safetensors"))
+
+    model = load_shared_weights(torch.nn.Linear(3, 2), tmp_path)
+    x = torch.randn(5, 3)
+    assert torch.allclose(model(x), source(x))
+
+
+def test_missing_checkpoint_leaves_model_alone(tmp_path):
+    assert load_shared_weights(torch.nn.Linear(3, 2), tmp_path) is None
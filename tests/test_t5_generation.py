@@ -0,0 +1,167 @@
+import sys
+import os
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import t5_generation
+from src.deadline import Deadline
+from src.score_cache import PersistentLRUCache
+from src.t5_generation import ChunkMemo, budgeted_batches, group_by_tokens, summarize_batch, tree_reduce
+
+
+class WordTokenizer:
+    """
+    One token per word; "summarize:" counts as one token.
+    """
+
+    def __call__(self, texts, add_special_tokens=True, **kwargs):
+        if isinstance(texts, str):
+            return {"input_ids": list(range(len(texts.split())))}
+        return {"input_ids": [list(range(len(t.split()))) for t in texts]}
+
+
+class ShrinkingSummarizer:
+    """
+    Summarizes a text to its first ``keep`` words and records every call.
+    """
+
+    def __init__(self, keep=3):
+        self.keep = keep
+        self.calls = []
+
+    def __call__(self, texts, kwargs):
+        self.calls.append((list(texts), kwargs))
+        return [" ".join(t.split()[:self.keep]) for t in texts]
+
+
+def words(n, tag):
+    return " ".join(f"{tag}{i}" for i in range(n))
+
+
+def test_group_by_tokens_packs_consecutive_texts():
+    texts = [words(4, "a"), words(4, "b"), words(3, "c"), words(9, "d")]
+    groups = group_by_tokens(texts, WordTokenizer(), max_tokens=8)
+    assert groups == [texts[0] + " " + texts[1], texts[2], texts[3]]
+
+
+def test_tree_reduce_levels_fan_in_and_final_pass():
+    tokenizer = WordTokenizer()
+    stage1 = [words(3, f"s{i}_") for i in range(16)]
+    summarize = ShrinkingSummarizer(keep=3)
+
+    # 10-token inputs minus one prefix token: 3 summaries per group
+    out = tree_reduce(stage1, tokenizer, summarize, {"level": True}, {"final": True}, max_input_tokens=10)
+
+    levels = [texts for texts, kwargs in summarize.calls if "level" in kwargs]
+    assert [len(level) for level in levels] == [6, 2]                  # 16 -> 6 -> 2 -> final
+    assert levels[0][0] == " ".join(stage1[:3])                         # fan-in of 3
+    final_texts, final_kwargs = summarize.calls[-1]
+    assert final_kwargs == {"final": True} and len(final_texts) == 1
+    assert out == " ".join(final_texts[0].split()[:3])
+
+
+def test_tree_reduce_final_pass_gets_every_stage1_summary_when_they_fit():
+    stage1 = [words(2, f"s{i}_") for i in range(4)]
+    summarize = ShrinkingSummarizer()
+    tree_reduce(stage1, WordTokenizer(), summarize, {"level": True}, {"final": True}, max_input_tokens=50)
+    assert summarize.calls == [([" ".join(stage1)], {"final": True})]
+
+
+def test_tree_reduce_stops_when_grouping_does_not_shrink():
+    # Every summary fills an input on its own, so grouping cannot reduce
+    stage1 = [words(9, f"s{i}_") for i in range(3)]
+    summarize = ShrinkingSummarizer(keep=9)
+    tree_reduce(stage1, WordTokenizer(), summarize, {"level": True}, {"final": True}, max_input_tokens=10)
+    assert [kwargs for _, kwargs in summarize.calls] == [{"final": True}]
+    assert summarize.calls[0][0] == [" ".join(stage1)]
+
+
+def fake_summarize_batch(calls):
+    def run(texts, tokenizer, model, device, gen_kwargs, deadline=None, **kwargs):
+        calls.append(list(texts))
+        return [f"summary of {t}" for t in texts]
+    return run
+
+
+def test_memo_hits_skip_generation(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(t5_generation, "summarize_batch", fake_summarize_batch(calls))
+    memo = ChunkMemo(PersistentLRUCache(tmp_path / "memo.sqlite"), "model-a")
+
+    first = memo.summarize(["one", "two", "one"], None, None, "cpu", {"num_beams": 4})
+    assert first == ["summary of one", "summary of two", "summary of one"]
+    assert calls == [["one", "two"]]
+
+    again = memo.summarize(["two", "three"], None, None, "cpu", {"num_beams": 4})
+    assert again == ["summary of two", "summary of three"]
+    assert calls[-1] == ["three"]
+
+    # Different decoding parameters are a different memo entry
+    memo.summarize(["one"], None, None, "cpu", {"num_beams": 2})
+    assert calls[-1] == ["one"]
+
+
+def test_nothing_memoized_once_deadline_missed(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(t5_generation, "summarize_batch", fake_summarize_batch(calls))
+    memo = ChunkMemo(PersistentLRUCache(tmp_path / "memo.sqlite"), "model-a")
+
+    deadline = Deadline.after(-1)
+    deadline.expired()
+    memo.summarize(["one"], None, None, "cpu", {}, deadline=deadline)
+    memo.summarize(["one"], None, None, "cpu", {})
+    assert calls == [["one"], ["one"]]
+
+
+def test_budgeted_batches_respect_the_token_budget():
+    lengths = [5, 40, 12, 40, 7, 100, 3, 25, 25, 60]
+    for beams in (1, 4):
+        batches = budgeted_batches(lengths, max_batch_tokens=240, num_beams=beams)
+        assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+        for batch in batches:
+            padded = max(lengths[i] for i in batch) * len(batch) * beams
+            # Only an item that alone exceeds the budget may go over it
+            assert padded <= 240 or len(batch) == 1
+
+
+class Batch(dict):
+    def to(self, device):
+        return self
+
+
+class PaddingTokenizer:
+    """
+    Word tokenizer with ``pad`` / ``decode`` in the shape summarize_batch uses.
+    """
+
+    def __call__(self, texts, truncation=True, max_length=None, **kwargs):
+        ids = [t.split() for t in texts]
+        return {"input_ids": ids, "attention_mask": [[1] * len(i) for i in ids]}
+
+    def pad(self, features, return_tensors=None):
+        return Batch(features)
+
+    def decode(self, seq, skip_special_tokens=True):
+        return " ".join(seq)
+
+
+class EchoModel:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def generate(self, input_ids, attention_mask=None, **kwargs):
+        self.batch_sizes.append(len(input_ids))
+        return [ids[1:] for ids in input_ids]     # drop the "summarize:" prefix
+
+
+def test_summarize_batch_returns_outputs_in_input_order(monkeypatch):
+    monkeypatch.setitem(sys.modules, "torch", SimpleNamespace(no_grad=nullcontext))
+    texts = [words(n, f"t{n}_") for n in (3, 30, 1, 12, 30, 7)]
+    model = EchoModel()
+
+    out = summarize_batch(texts, PaddingTokenizer(), model, "cpu", {"num_beams": 2}, max_batch_tokens=64)
+
+    assert out == texts
+    assert len(model.batch_sizes) > 1 and sum(model.batch_sizes) == len(texts)
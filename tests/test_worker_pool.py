@@ -0,0 +1,67 @@
+import sys
+import os
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.worker_pool import ModelWorkerPool
+
+
+def init_offset(offset):
+    return offset
+
+
+def add_offset(offset, items):
+    return [x + offset for x in items]
+
+
+def crash_on_seven(offset, items):
+    if 7 in items:
+        os._exit(1)
+    return [x + offset for x in items]
+
+
+def raise_on_three(offset, items):
+    if 3 in items:
+        raise ValueError("bad item")
+    return [x + offset for x in items]
+
+
+def sleep_forever(offset, items):
+    time.sleep(60)
+    return items
+
+
+def test_outputs_come_back_in_input_order():
+    with ModelWorkerPool(init_offset, add_offset, workers=3, init_args=(100,), items_per_task=4) as pool:
+        assert pool.map(list(range(50))) == [x + 100 for x in range(50)]
+        # Workers stay loaded between calls
+        assert pool.map([1, 2]) == [101, 102]
+
+        seen = {}
+        pool.map([5, 6, 7], on_output=seen.__setitem__)
+        assert seen == {0: 105, 1: 106, 2: 107}
+
+
+def test_crashing_item_is_isolated_and_reported():
+    with ModelWorkerPool(init_offset, crash_on_seven, workers=2, init_args=(1,), items_per_task=4) as pool:
+        out = pool.map(list(range(12)))
+        assert out == [x + 1 if x != 7 else None for x in range(12)]
+        assert list(pool.failures) == [7]
+        # Replacement workers keep serving later calls
+        assert pool.map([1, 2]) == [2, 3]
+
+
+def test_raising_item_is_retried_then_reported():
+    with ModelWorkerPool(init_offset, raise_on_three, workers=2, init_args=(0,), items_per_task=3) as pool:
+        out = pool.map(list(range(6)))
+    assert out == [0, 1, 2, None, 4, 5]
+    assert "bad item" in pool.failures[3]
+
+
+def test_map_gives_up_after_timeout():
+    with ModelWorkerPool(init_offset, sleep_forever, workers=1, init_args=(0,), timeout=2) as pool:
+        with pytest.raises(TimeoutError):
+            pool.map([1])